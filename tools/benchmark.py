@@ -0,0 +1,295 @@
+"""Benchmarks for the Tiro Builder pipeline.
+
+Times each stage of the build of the checked-in Castoro sources in isolation,
+as well as end-to-end builds of the YAML projects, and stores the results as
+JSON that can be compared against a previous (baseline) run.
+"""
+
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from functools import cached_property
+from pathlib import Path
+
+from tirobuild import Builder, Format, FontSnapshot, toolversions
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class Inputs:
+    """Lazily built inputs of the benchmarked stages, shared between
+    benchmarks so that each stage is timed on its own."""
+
+    def __init__(self, output):
+        self.output = Path(output)
+
+    def font(self, project, name, fmt=None):
+        builder = Builder(ROOT / project)
+        font = next(f for f in builder.fonts if f.name == name)
+        font.output = self.output
+        font.fmt = fmt
+        return font
+
+    def variable(self, fmt):
+        return self.font("castoro-text.yml", "Castoro-Roman", fmt)
+
+    @cached_property
+    def designspace(self):
+        from fontTools.designspaceLib import DesignSpaceDocument
+
+        font = self.variable(None)
+        ds = DesignSpaceDocument.fromfile(font.source)
+        ds.loadSourceFonts(lambda p: font._openufo(Path(p), font.source))
+        return ds
+
+    def compile(self, fmt):
+        from ufo2ft import (
+            compileInterpolatableOTFsFromDS,
+            compileInterpolatableTTFsFromDS,
+        )
+
+        if fmt == Format.TTF:
+            return compileInterpolatableTTFsFromDS(self.designspace, inplace=False)
+        return compileInterpolatableOTFsFromDS(self.designspace, inplace=False)
+
+    @cached_property
+    def masters(self):
+        return {fmt: self.compile(fmt) for fmt in (Format.TTF, Format.OTF)}
+
+    def mastercopy(self, fmt):
+        """A copy of the compiled masters, since varLib modifies them."""
+        from copy import copy
+
+        ds = copy(self.masters[fmt])
+        ds.sources = [copy(s) for s in ds.sources]
+        for source in ds.sources:
+            source.font = FontSnapshot(source.font).open()
+        return ds
+
+    @cached_property
+    def vfs(self):
+        from fontTools.varLib import build
+
+        vfs = {}
+        for fmt in self.masters:
+            font = self.variable(fmt)
+            vf, _, _ = build(self.mastercopy(fmt))
+            vf = font._setnames(vf)
+            vf = font._postprocess(vf)
+            vfs[fmt] = FontSnapshot(vf)
+        return vfs
+
+    @cached_property
+    def statics(self):
+        """Unhinted and unoptimized Castoro-Regular instances."""
+        return {
+            fmt: FontSnapshot(instantiate(snapshot.open()))
+            for fmt, snapshot in self.vfs.items()
+        }
+
+    def static(self, fmt):
+        font = self.variable(fmt)
+        font.name = "Castoro-Regular"
+        font.variable = False
+        font.STAT = None
+        return font, self.statics[fmt].open()
+
+    def subsetter(self, fmt):
+        from tirobuild import mergeConfigs
+
+        font = self.variable(fmt)
+        otf = self.vfs[fmt].open()
+        glyphlist = set(otf.getGlyphOrder()[:200])
+        subset = {"glyphlist": glyphlist, "langsys": ["*"]}
+        font.subsets = {
+            "CastoroSubset-Roman": mergeConfigs(subset, font.conf, skip=["instances"])
+        }
+        return font, otf
+
+
+def benchmarks(inputs):
+    """Return (name, setup, run) tuples, `setup` returns the arguments of
+    `run` and is not timed."""
+
+    def stage(fmt, method, static=False):
+        def setup():
+            if static:
+                font, otf = inputs.static(fmt)
+            else:
+                font = inputs.variable(fmt)
+                otf = inputs.vfs[fmt].open()
+            return getattr(font, method), otf
+
+        return setup
+
+    def call(method, *args):
+        method(*args)
+
+    def project(name):
+        def setup():
+            builder = Builder(ROOT / name)
+            for font in builder.fonts:
+                font.output = inputs.output
+            return (builder,)
+
+        return setup
+
+    def openufo(font):
+        # Opening is lazy, load the glyphs too so that versions opening the
+        # sources differently are compared on the same work.
+        for source in inputs.designspace.sources:
+            font._openufo(Path(source.path), font.source).unlazify()
+
+    yield "openufo", lambda: (inputs.variable(None),), openufo
+    for fmt in (Format.TTF, Format.OTF):
+        ext = fmt.value
+        yield f"compile.{ext}", lambda fmt=fmt: (fmt,), inputs.compile
+        yield f"varlib.{ext}", lambda fmt=fmt: (inputs.mastercopy(fmt),), varlib
+        yield f"instantiate.{ext}", lambda fmt=fmt: (
+            inputs.vfs[fmt].open(),
+        ), instantiate
+        yield f"instances.{ext}", stage(fmt, "_instanciate"), call
+        yield f"subset.{ext}", lambda fmt=fmt: inputs.subsetter(fmt), subset
+        yield f"autohint.{ext}", stage(fmt, "_autohint", True), call
+        yield f"optimize.{ext}", stage(fmt, "_optimize", True), call
+        yield f"buildwoff.{ext}", stage(fmt, "_buildwoff", True), call
+    yield "project.castoro-text", project("castoro-text.yml"), build
+    yield "project.castoro-titling", project("castoro-titling.yml"), build
+
+
+def instantiate(vf):
+    """Instantiate the variable font at Castoro-Regular, without the rest of
+    the static instances pipeline (hinting, optimization, saving…)."""
+    from fontTools.varLib.mutator import instantiateVariableFont
+
+    from tirobuild import instantiateCFF2
+
+    coordinates = {"wght": 400}
+    if "CFF2" in vf:
+        vf = instantiateCFF2(vf, coordinates)
+    return instantiateVariableFont(vf, coordinates, inplace=True)
+
+
+def varlib(ds):
+    from fontTools.varLib import build
+
+    build(ds)
+
+
+def subset(font, otf):
+    font._subset(otf)
+
+
+def build(builder):
+    builder.build()
+
+
+def measure(setup, run, warmup, repeat):
+    for _ in range(warmup):
+        run(*setup())
+
+    wall = []
+    cpu = []
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter(), time.process_time()
+        run(*args)
+        wall.append(time.perf_counter() - start[0])
+        cpu.append(time.process_time() - start[1])
+
+    return {
+        "wall": wall,
+        "cpu": cpu,
+        "min": min(wall),
+        "median": statistics.median(wall),
+        "mean": statistics.mean(wall),
+        "stdev": statistics.stdev(wall) if len(wall) > 1 else 0.0,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print a comparison of the median times with those of baseline, and
+    return the names of the benchmarks that regressed by more than
+    threshold."""
+    regressions = []
+    print(f"{'Benchmark':<28}{'Baseline (s)':>14}{'Current (s)':>14}{'Speedup':>10}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old = baseline[name]["median"]
+        new = result["median"]
+        speedup = old / new if new else float("inf")
+        flag = ""
+        if new > old * (1 + threshold):
+            regressions.append(name)
+            flag = " !"
+        print(f"{name:<28}{old:>14.3f}{new:>14.3f}{speedup:>9.2f}x{flag}")
+    return regressions
+
+
+def main(args=None):
+    import json
+    import os
+    import platform
+    import re
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Benchmark the Tiro Builder pipeline.")
+    parser.add_argument(
+        "-o", "--output", metavar="JSON", type=Path, help="Write results to JSON."
+    )
+    parser.add_argument(
+        "-b", "--baseline", metavar="JSON", type=Path, help="Compare with JSON."
+    )
+    parser.add_argument(
+        "-k",
+        metavar="PATTERN",
+        help="Only run benchmarks whose name matches the regular expression.",
+    )
+    parser.add_argument("--warmup", type=int, default=1, help="Warm-up runs.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown reported as a regression (default: %(default)s).",
+    )
+    options = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.ERROR)
+    # Keep timestamps, and thus outputs, stable between runs.
+    os.environ.setdefault("SOURCE_DATE_EPOCH", "0")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as output:
+        inputs = Inputs(output)
+        for name, setup, run in benchmarks(inputs):
+            if options.k and not re.search(options.k, name):
+                continue
+            result = measure(setup, run, options.warmup, options.repeat)
+            results[name] = result
+            print(f"{name:<28}{result['median']:>10.3f} s ± {result['stdev']:.3f}")
+
+    if options.output:
+        meta = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "tools": toolversions(),
+            "warmup": options.warmup,
+            "repeat": options.repeat,
+        }
+        with open(options.output, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, options.threshold):
+            return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Tests for the Tiro Builder, run with `python -m pytest tools`."""
+
+from tirobuild import Cache, Font, Format, compression, compressionSettings
+
+
+def overlapping(advance):
+    """A TrueType font with a glyph made of two overlapping squares."""
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+    pen = TTGlyphPen(None)
+    for x, y in ((100, 0), (300, 200)):
+        pen.moveTo((x, y))
+        pen.lineTo((x, y + 400))
+        pen.lineTo((x + 400, y + 400))
+        pen.lineTo((x + 400, y))
+        pen.closePath()
+
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder([".notdef", "a"])
+    fb.setupCharacterMap({ord("a"): "a"})
+    fb.setupGlyf({".notdef": TTGlyphPen(None).glyph(), "a": pen.glyph()})
+    fb.setupHorizontalMetrics({".notdef": (500, 0), "a": (advance, 100)})
+    fb.setupHorizontalHeader()
+    return fb.font
+
+
+def test_removeoverlaps_cached_advance(tmp_path):
+    """Glyphs whose overlaps were removed from the cache keep their advance."""
+    font = Font("Test-Regular", {"source": "Test.ufo", "path": tmp_path / "t.yml"}, {})
+    font.fmt = Format.TTF
+    font.cache = Cache(tmp_path / "cache", 1 << 30)
+
+    for advance in (679, 779):
+        otf = font._removeoverlaps(overlapping(advance))
+        assert otf["glyf"]["a"].numberOfContours == 1
+        assert otf["hmtx"]["a"] == (advance, 100)
+
+
+def test_hasinstance_designspace_names(tmp_path):
+    """Instances are selected by their designspace names when the project
+    builds all of them."""
+    from fontTools.designspaceLib import DesignSpaceDocument
+
+    ds = DesignSpaceDocument()
+    ds.addInstanceDescriptor(styleName="Semi Bold", postScriptFontName="Test-SemiBd")
+    ds.write(tmp_path / "Test.designspace")
+    conf = {"source": "Test.designspace", "instances": "all"}
+    font = Font("Test-Roman", {**conf, "path": tmp_path / "t.yml"}, {})
+
+    for key in ("Test-SemiBd", "Semi Bold", "Test-SemiBold", "Test-Semi Bold"):
+        assert font.hasinstance(key)
+    assert not font.hasinstance("Test-Bold")
+
+
+def test_compression_woff2_metadata(tmp_path):
+    """WOFF2 fonts with metadata can be written with compression settings."""
+    from fontTools.ttLib import TTFont
+    from fontTools.ttLib.woff2 import WOFF2FlavorData
+
+    otf = overlapping(500)
+    otf.flavor = "woff2"
+    otf.flavorData = WOFF2FlavorData()
+    otf.flavorData.metaData = b"<metadata version='1.0'/>"
+    with compression(compressionSettings("dev")):
+        otf.save(tmp_path / "t.woff2")
+
+    assert TTFont(tmp_path / "t.woff2").flavorData.metaData == otf.flavorData.metaData
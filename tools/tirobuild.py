@@ -1,6 +1,9 @@
 import logging
+import shutil
+from contextlib import contextmanager
 from copy import deepcopy
 from enum import Enum
+from functools import lru_cache, wraps
 from pathlib import Path
 
 import yaml
@@ -53,6 +56,70 @@ class Format(Enum):
     WOFF2 = "woff2"
 
 
+# Compression settings of the web formats. The default is that of fontTools,
+# “dev” trades file size for speed and “release” for the smallest files.
+COMPRESSION_PROFILES = {
+    "default": {"woff": {"level": 6, "zopfli": False}, "woff2": {"quality": 11}},
+    "dev": {"woff": {"level": 1, "zopfli": False}, "woff2": {"quality": 4}},
+    "release": {"woff": {"level": 9, "zopfli": True}, "woff2": {"quality": 11}},
+}
+
+
+def compressionSettings(conf):
+    """Resolve a “compression” configuration, either a profile name or a
+    dictionary with an optional “profile” and per-format overrides."""
+    if conf is None:
+        conf = {}
+    if isinstance(conf, str):
+        conf = {"profile": conf}
+    if not isinstance(conf, dict):
+        raise RuntimeError(f"Unsupported “compression” value: “{conf}”")
+
+    profile = conf.get("profile", "default")
+    if profile not in COMPRESSION_PROFILES:
+        raise RuntimeError(f"Unknown “compression” profile: “{profile}”")
+
+    settings = deepcopy(COMPRESSION_PROFILES[profile])
+    for key, value in conf.items():
+        if key == "profile":
+            continue
+        if key not in settings or not isinstance(value, dict):
+            raise RuntimeError(f"Unsupported “compression” key: “{key}”")
+        for option in value:
+            if option not in settings[key]:
+                raise RuntimeError(
+                    f"Unsupported “{key}” compression option: “{option}”"
+                )
+        settings[key].update(value)
+
+    if not 0 <= settings["woff"]["level"] <= 9:
+        raise RuntimeError("“woff” compression level must be between 0 and 9")
+    if not 0 <= settings["woff2"]["quality"] <= 11:
+        raise RuntimeError("“woff2” compression quality must be between 0 and 11")
+
+    return settings
+
+
+@contextmanager
+def compression(settings):
+    """Apply compression settings to the fontTools WOFF and WOFF2 writers,
+    which only support module level ones."""
+    from functools import partial
+    from unittest import mock
+
+    from fontTools.ttLib import sfnt, woff2
+
+    # Only compress() is patched, the writer uses the other brotli attributes
+    # (e.g. MODE_TEXT for the metadata) as they are.
+    compress = partial(woff2.brotli.compress, quality=settings["woff2"]["quality"])
+    with mock.patch.multiple(
+        sfnt,
+        ZLIB_COMPRESSION_LEVEL=settings["woff"]["level"],
+        USE_ZOPFLI=settings["woff"]["zopfli"],
+    ), mock.patch.object(woff2.brotli, "compress", compress):
+        yield
+
+
 def getName(font, nameID):
     name = font["name"].getName(nameID, platformID=3, platEncID=1, langID=0x409)
     if name:
@@ -66,12 +133,18 @@ def setName(font, nameID, string):
 
 def instanceMatch(key, instance, font):
     psname = getName(font, instance.postscriptNameID)
+    subfamily = getName(font, instance.subfamilyNameID)
+    return namesMatch(key, psname, subfamily)
+
+
+def namesMatch(key, psname, subfamily):
+    """Whether `key` names the instance with the given PostScript and
+    subfamily names, as the “instances” keys of the project do."""
     if key == psname:
         return True
-    subfamily = getName(font, instance.subfamilyNameID)
     if key == subfamily:
         return True
-    if "-" in key:
+    if subfamily and "-" in key:
         part = key.split("-", 1)[1]
         if subfamily == part:
             return True
@@ -104,6 +177,188 @@ def mergeConfigs(first, second, skip=None):
     return conf
 
 
+def _canonical(obj):
+    # Convert a configuration to something that can be serialized to JSON in
+    # a stable way, for hashing.
+    if isinstance(obj, dict):
+        return sorted([str(k), _canonical(v)] for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v) for v in obj]
+    if isinstance(obj, (set, frozenset)):
+        return sorted(_canonical(v) for v in obj)
+    if isinstance(obj, Path):
+        return str(obj)
+    return obj
+
+
+def hashfiles(hasher, path, skip=()):
+    """Update hasher with the names and contents of path, or of all the files
+    under it if it is a directory (e.g. a UFO) but those with a `skip`
+    suffix."""
+    path = Path(path)
+    if path.is_dir():
+        files = sorted(
+            p for p in path.rglob("*") if p.is_file() and not p.name.endswith(skip)
+        )
+    else:
+        files = [path]
+    for file in files:
+        hasher.update(file.relative_to(path.parent).as_posix().encode("utf-8"))
+        hasher.update(b"\0")
+        hasher.update(file.read_bytes())
+        hasher.update(b"\0")
+
+
+def fileStamps(paths, listings=None):
+    """Return the modification times and sizes of the given files, or of all
+    the files under them for directories, to tell when they change.
+
+    `listings` keeps the files found under each directory between calls,
+    the directories are only walked again when one of their modification
+    times changed (i.e. files were added, removed or renamed)."""
+    import os
+
+    if listings is None:
+        listings = {}
+
+    def mtimes(dirs):
+        times = []
+        for path in dirs:
+            try:
+                times.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                times.append(None)
+        return times
+
+    stamps = {}
+    for path in paths:
+        path = Path(path)
+        if not path.is_dir():
+            files = [str(path)]
+        else:
+            listing = listings.get(path)
+            if listing is None or mtimes(listing[0]) != listing[1]:
+                dirs, files = [], []
+                for root, _, names in os.walk(path):
+                    dirs.append(root)
+                    files.extend(os.path.join(root, name) for name in names)
+                listing = listings[path] = dirs, mtimes(dirs), files
+            files = listing[2]
+        for file in files:
+            try:
+                stat = os.stat(file)
+            except OSError:
+                stamps[file] = None
+            else:
+                stamps[file] = stat.st_mtime_ns, stat.st_size
+    return stamps
+
+
+def toolversions():
+    from importlib.metadata import PackageNotFoundError, version
+
+    versions = {}
+    for package in (
+        "fonttools",
+        "ufo2ft",
+        "ufoLib2",
+        "cffsubr",
+        "ttfautohint-py",
+        "psautohint",
+        "skia-pathops",
+        "axisregistry",
+        # Web fonts compression.
+        "brotli",
+        "zopfli",
+    ):
+        try:
+            versions[package] = version(package)
+        except PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+
+class Cache:
+    """A persistent cache on disk, keyed by content hashes.
+
+    Entries are stored under `kind` sub-directories, and once the cache
+    grows over `maxsize` bytes the least recently used entries are evicted.
+    """
+
+    def __init__(self, path, maxsize):
+        self.path = Path(path)
+        self.maxsize = maxsize
+
+    def _entry(self, kind, key):
+        return self.path / kind / key[:2] / key
+
+    def _hit(self, entry):
+        if not entry.exists():
+            return None
+        # Bump the modification time, for least recently used eviction.
+        entry.touch()
+        return entry
+
+    def get(self, kind, key):
+        entry = self._hit(self._entry(kind, key))
+        if entry is None:
+            return None
+        return entry.read_bytes()
+
+    def put(self, kind, key, data):
+        import tempfile
+
+        entry = self._entry(kind, key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=entry.parent, delete=False) as f:
+            f.write(data)
+        Path(f.name).replace(entry)
+
+    def getfiles(self, kind, key):
+        return self._hit(self._entry(kind, key))
+
+    def putfiles(self, kind, key, files):
+        import tempfile
+
+        entry = self._entry(kind, key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=entry.parent))
+        for name, path in files.items():
+            dest = tmp / name
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(path, dest)
+        shutil.rmtree(entry, ignore_errors=True)
+        tmp.rename(entry)
+        entry.touch()
+
+    def evict(self):
+        if not self.path.exists():
+            return
+
+        entries = []
+        for entry in self.path.glob("*/*/*"):
+            if entry.is_dir():
+                size = sum(p.stat().st_size for p in entry.rglob("*") if p.is_file())
+            else:
+                size = entry.stat().st_size
+            entries.append((entry.stat().st_mtime, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.maxsize:
+                break
+            logger.info(f"Evicting {entry.name} from cache")
+            if entry.is_dir():
+                shutil.rmtree(entry, ignore_errors=True)
+            else:
+                entry.unlink(missing_ok=True)
+            try:
+                entry.parent.rmdir()
+            except OSError:
+                pass
+            total -= size
+
+
 def splitfearureparamtag(tag):
     script = None
     langsys = None
@@ -163,6 +418,510 @@ def collectfeatures(table, tag):
     return [f.Feature for f in features if f.FeatureTag == tag]
 
 
+class FontSnapshot:
+    """A compiled font kept in a single read-only buffer, from which fresh
+    TTFont objects can be loaded on demand."""
+
+    def __init__(self, otf):
+        from io import BytesIO
+
+        buf = BytesIO()
+        otf.save(buf)
+        self.data = buf.getvalue()
+
+    def open(self):
+        from io import BytesIO
+
+        from fontTools.ttLib import TTFont
+
+        return TTFont(BytesIO(self.data))
+
+    @classmethod
+    def load(cls, path):
+        """Return the snapshot of the font file at path."""
+        snapshot = cls.__new__(cls)
+        snapshot.data = Path(path).read_bytes()
+        return snapshot
+
+
+# Snapshots read by the running task, loaded by _snapshotcall() from the files
+# written by Scheduler.share().
+_snapshots = {}
+
+
+def _snapshotcall(key, snapshot, call):
+    # Run a scheduled task with the snapshot it reads as `key`, given as is or
+    # as the path of its file.
+    if not isinstance(snapshot, FontSnapshot):
+        snapshot = FontSnapshot.load(snapshot)
+    _snapshots[key] = snapshot
+    try:
+        return call()
+    finally:
+        _snapshots.pop(key, None)
+
+
+def _taggedcall(name, function, *args):
+    # Tag log records with the font name, so that the output of fonts being
+    # built concurrently can still be told apart.
+    fontfilter = FontLogFilter(name)
+    handlers = logging.getLogger().handlers
+    for handler in handlers:
+        handler.addFilter(fontfilter)
+    try:
+        return function(*args)
+    finally:
+        for handler in handlers:
+            handler.removeFilter(fontfilter)
+
+
+def _workerstate():
+    return logging.getLogger().level, _profiler
+
+
+def _initworker(state):
+    global _profiler
+
+    level, profiler = state
+    # Worker processes that were not forked from the main process (e.g. when
+    # the “spawn” start method is used) need their logging and profiling set
+    # up again.
+    if not logging.getLogger().handlers:
+        setuplogging(level)
+    if profiler is not None and _profiler is None:
+        _profiler = profiler
+        profiler.start()
+
+
+def availableMemory():
+    """Return the memory available for new processes in bytes, or None if it
+    is not known."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+# The share of the available memory the scheduler lets the tasks of the build
+# use, and the estimated peak memory of the tasks compiling the sources of a
+# font and of those building outputs from a compiled font, as multiples of the
+# size of the source files and of the compiled font. Measured on Castoro, the
+# peak RSS growth of a worker compiling the sources was 40–85 times their size,
+# and building an instance, subset or final file 130–290 times the size of the
+# variable font it reads (470 times for a small static font).
+SCHEDULER_MEMORY = 0.75
+SOURCE_TASK_MEMORY = 50
+FONT_TASK_MEMORY = 300
+
+
+def fontTaskMemory(snapshot):
+    return len(snapshot.data) * FONT_TASK_MEMORY
+
+
+class Task:
+    """A node of the build graph: `function` is called with the outputs of
+    the `inputs` tasks followed by `args`, and returns the output of the
+    task."""
+
+    def __init__(self, function, args, inputs, local, memory, group):
+        self.function = function
+        self.args = args
+        self.inputs = inputs
+        self.local = local
+        self.memory = memory
+        self.group = group
+
+    def arguments(self, results):
+        return (*(results[task] for task in self.inputs), *self.args)
+
+    def estimate(self, results):
+        if callable(self.memory):
+            return self.memory(*(results[task] for task in self.inputs))
+        return self.memory
+
+
+class Scheduler:
+    """Runs a graph of tasks in a pool of `jobs` worker processes, each task
+    as soon as its inputs are ready.
+
+    Local tasks run in the main process, for tasks sharing state that can not
+    be sent to the workers, and can add more tasks while running. The other
+    tasks start only while their estimated memory fits in the available
+    memory (but one, which always starts), so that many heavy tasks running
+    together do not exhaust it.
+
+    The tasks should not start worker processes of their own, the `jobs`
+    workers are all the build runs in parallel.
+
+    Tasks can belong to a `group` (the font they build): a failing task is
+    logged and skips the remaining tasks of its group, whose name is added to
+    `failed`, instead of stopping the others. With `tag`, the log records of
+    each task are tagged with its group."""
+
+    def __init__(self, jobs, memory=None, tag=False):
+        if memory is None:
+            available = availableMemory()
+            if available is not None:
+                memory = int(available * SCHEDULER_MEMORY)
+        self.jobs = jobs
+        self.memory = memory
+        self.tag = tag
+        self.tasks = []
+        self.failed = []
+        self.directory = None
+
+    def add(self, function, *args, inputs=(), local=False, memory=0, group=None):
+        """Add a task and return it. `memory` is its estimated memory in bytes,
+        or a function returning it given the outputs of the `inputs` tasks."""
+        task = Task(function, args, tuple(inputs), local, memory, group)
+        self.tasks.append(task)
+        return task
+
+    def share(self, snapshot):
+        """Return the argument passing snapshot to tasks (see _snapshotcall()):
+        the snapshot itself when the tasks run in this process, or the path of
+        a temporary file holding it, so that it is written once instead of
+        being pickled for every task."""
+        if self.jobs == 1:
+            return snapshot
+
+        import os
+        import tempfile
+
+        if self.directory is None:
+            self.directory = tempfile.TemporaryDirectory(prefix="tirobuild-")
+        fd, path = tempfile.mkstemp(suffix=".otf", dir=self.directory.name)
+        with os.fdopen(fd, "wb") as f:
+            f.write(snapshot.data)
+        return path
+
+    def run(self):
+        """Run all the tasks, and return their outputs keyed by task."""
+        try:
+            return self._run()
+        finally:
+            if self.directory is not None:
+                self.directory.cleanup()
+                self.directory = None
+
+    def _call(self, task, results):
+        # The function and arguments running task.
+        args = task.arguments(results)
+        if self.tag and task.group is not None:
+            return (_taggedcall, task.group, task.function, *args)
+        return (task.function, *args)
+
+    def _fail(self, task, error):
+        if task.group is None:
+            raise error
+        if task.group not in self.failed:
+            logger.error(f"Building {task.group} failed", exc_info=error)
+            self.failed.append(task.group)
+
+    def _run(self):
+        results = {}
+        if self.jobs == 1:
+            # Tasks are added after their inputs, running them in order
+            # satisfies the dependencies.
+            i = 0
+            while i < len(self.tasks):
+                task = self.tasks[i]
+                i += 1
+                if task.group in self.failed:
+                    continue
+                function, *args = self._call(task, results)
+                try:
+                    results[task] = function(*args)
+                except Exception as error:
+                    self._fail(task, error)
+            return results
+
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+        pending = []
+        running = {}
+        added = 0
+        used = 0
+        state = _workerstate()
+        with ProcessPoolExecutor(
+            self.jobs, initializer=_initworker, initargs=(state,)
+        ) as executor:
+            while True:
+                pending += self.tasks[added:]
+                added = len(self.tasks)
+                pending = [t for t in pending if t.group not in self.failed]
+                if not pending and not running:
+                    return results
+
+                ready = [t for t in pending if all(i in results for i in t.inputs)]
+                for task in ready:
+                    if task.local:
+                        continue
+                    memory = task.estimate(results)
+                    if len(running) >= self.jobs or (
+                        running
+                        and self.memory is not None
+                        and used + memory > self.memory
+                    ):
+                        break
+                    future = executor.submit(*self._call(task, results))
+                    running[future] = task, memory
+                    used += memory
+                    pending.remove(task)
+
+                local = next((t for t in ready if t.local), None)
+                if local is not None:
+                    pending.remove(local)
+                    function, *args = self._call(local, results)
+                    try:
+                        results[local] = function(*args)
+                    except Exception as error:
+                        self._fail(local, error)
+                    continue
+
+                if not running:
+                    raise RuntimeError("Tasks depend on tasks that were not added")
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task, memory = running.pop(future)
+                    used -= memory
+                    try:
+                        results[task] = future.result()
+                    except Exception as error:
+                        self._fail(task, error)
+
+
+def peakRSS():
+    """Return the peak resident set size of this process in bytes since it
+    was last reset by resetPeakRSS(), or None where it can not be read (only
+    on Linux)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def resetPeakRSS():
+    """Reset the peak resident set size of this process to its current size,
+    and return whether it could be reset (only on Linux 4.0 and later)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+
+class Profiler:
+    """Records the wall time, CPU time and memory of build stages.
+
+    The memory is the peak resident set size of the process during each
+    stage, including the short-lived spikes that happen inside it.
+
+    Each process appends its records to its own file in `path`, so that the
+    stages run in worker processes are collected too; `report` merges them.
+    With `tracemalloc`, the top Python allocators of each stage are recorded
+    as well.
+    """
+
+    def __init__(self, path, tracemalloc=0):
+        self.path = Path(path)
+        self.tracemalloc = tracemalloc
+        # The peaks of the running nested stages of this process, as
+        # resetting the peak RSS for a stage also resets it for those
+        # enclosing it.
+        self.peaks = []
+
+    def start(self):
+        import cffsubr
+
+        if self.tracemalloc:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+        # Record the tx subprocess runs, both ours and the ones made by
+        # cffsubr.subroutinize().
+        run = cffsubr._run_embedded_tx
+        if not hasattr(run, "profiled"):
+
+            @wraps(run)
+            def profiled(*args, **kwargs):
+                with profile("tx"):
+                    return run(*args, **kwargs)
+
+            profiled.profiled = True
+            cffsubr._run_embedded_tx = profiled
+
+    @contextmanager
+    def stage(self, stage, **info):
+        import json
+        import os
+        import threading
+        import time
+
+        if self.tracemalloc:
+            import tracemalloc
+
+            tracemalloc.reset_peak()
+
+        start = time.time()
+        wall = time.perf_counter()
+        times = os.times()
+        self._foldpeak()
+        self.peaks.append(0 if resetPeakRSS() else None)
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            end = os.times()
+            # Include the CPU time of subprocesses, e.g. tx.
+            cpu = sum(end[:4]) - sum(times[:4])
+            self._foldpeak()
+            peak = self.peaks.pop()
+            if self.peaks and self.peaks[-1] is not None and peak is not None:
+                self.peaks[-1] = max(self.peaks[-1], peak)
+            record = {
+                **info,
+                "stage": stage,
+                "start": start,
+                "wall": wall,
+                "cpu": cpu,
+                "peakrss": peak,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            }
+            if self.tracemalloc:
+                snapshot = tracemalloc.take_snapshot()
+                stats = snapshot.statistics("lineno")[: self.tracemalloc]
+                record["tracemalloc"] = {
+                    "peak": tracemalloc.get_traced_memory()[1],
+                    "top": [
+                        {"location": str(stat.traceback), "size": stat.size}
+                        for stat in stats
+                    ],
+                }
+            with open(self.path / f"{os.getpid()}.jsonl", "a") as f:
+                f.write(json.dumps(record) + "\n")
+
+    def _foldpeak(self):
+        # Add the peak RSS since the last reset to the innermost stage.
+        if self.peaks and self.peaks[-1] is not None:
+            self.peaks[-1] = max(self.peaks[-1], peakRSS() or 0)
+
+    def records(self):
+        import json
+
+        records = []
+        for path in sorted(self.path.glob("*.jsonl")):
+            with open(path) as f:
+                records += [json.loads(line) for line in f]
+        return sorted(records, key=lambda r: r["start"])
+
+    def report(self, path):
+        import json
+
+        records = self.records()
+        with open(path, "w") as f:
+            json.dump({"stages": records}, f, indent=2)
+
+        summary = {}
+        for record in records:
+            entry = summary.setdefault(record["stage"], [0, 0.0, 0.0, 0])
+            entry[0] += 1
+            entry[1] += record["wall"]
+            entry[2] += record["cpu"]
+            entry[3] = max(entry[3], record["peakrss"] or 0)
+
+        # The largest peak RSS of the stage.
+        print(
+            f"{'Stage':<24}{'Count':>8}{'Wall (s)':>12}{'CPU (s)':>12}"
+            f"{'Peak RSS (MB)':>16}"
+        )
+        for name, (count, wall, cpu, peak) in sorted(
+            summary.items(), key=lambda item: -item[1][1]
+        ):
+            print(
+                f"{name:<24}{count:>8}{wall:>12.2f}{cpu:>12.2f}"
+                f"{peak / 2**20:>16.1f}"
+            )
+        print(f"Profile written to {path}")
+
+    def trace(self, path):
+        """Write the recorded stages as Chrome Trace Event Format spans, that
+        can be loaded in Perfetto or chrome://tracing."""
+        import json
+
+        events = []
+        pids = {}
+        for record in self.records():
+            pid = record["pid"]
+            if pid not in pids:
+                pids[pid] = record.get("font")
+            name = record["stage"]
+            if record.get("name"):
+                name += f" {record['name']}"
+                if record.get("format"):
+                    name += f".{record['format']}"
+            args = {k: record.get(k) for k in ("font", "name", "format")}
+            events.append(
+                {
+                    "name": name,
+                    "cat": record["stage"],
+                    "ph": "X",
+                    "ts": record["start"] * 1e6,
+                    "dur": record["wall"] * 1e6,
+                    "pid": pid,
+                    "tid": record["tid"],
+                    "args": {**args, "cpu": record["cpu"]},
+                }
+            )
+        for pid, font in pids.items():
+            label = "tirobuild" if font is None else f"tirobuild {font}"
+            events.append(
+                {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": label}}
+            )
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        print(f"Trace written to {path}")
+
+
+_profiler = None
+
+
+@contextmanager
+def profile(stage, **info):
+    if _profiler is None:
+        yield
+    else:
+        with _profiler.stage(stage, **info):
+            yield
+
+
+def stage(name):
+    """Decorator for Font methods, profiling them as the named stage."""
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self._stage(name):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
 def run_tx(otf, options, outTag=None):
     import cffsubr
     import subprocess
@@ -247,9 +1006,640 @@ def instantiateCFF2(otf, coordinates):
     return otf
 
 
+def _transformbox(box, transform):
+    """Bounding box of the (xMin, yMin, xMax, yMax) box transformed by the
+    (xx, xy, yx, yy, dx, dy) transformation."""
+    from fontTools.misc.arrayTools import calcBounds
+    from fontTools.misc.transform import Transform
+
+    xMin, yMin, xMax, yMax = box
+    corners = [(xMin, yMin), (xMin, yMax), (xMax, yMin), (xMax, yMax)]
+    return calcBounds(Transform(*transform).transformPoints(corners))
+
+
+def overlappingComposites(glyf, glyphOrder):
+    """Return the composite glyphs of glyphOrder with at least two components
+    whose bounding boxes intersect. The others can not have overlapping
+    components."""
+    from functools import reduce
+    from itertools import combinations
+
+    from fontTools.misc.arrayTools import calcBounds, unionRect
+
+    bounds = {}
+
+    def componentboxes(glyph):
+        boxes = []
+        for component in glyph.components:
+            box = glyphbounds(component.glyphName)
+            if box is not None:
+                boxes.append(_transformbox(box, component.getComponentInfo()[1]))
+        return boxes
+
+    def glyphbounds(name):
+        if name not in bounds:
+            glyph = glyf[name]
+            if glyph.isComposite():
+                boxes = componentboxes(glyph)
+                bounds[name] = reduce(unionRect, boxes) if boxes else None
+            elif glyph.numberOfContours > 0:
+                bounds[name] = calcBounds(glyph.coordinates)
+            else:
+                bounds[name] = None
+        return bounds[name]
+
+    overlapping = set()
+    for name in glyphOrder:
+        glyph = glyf[name]
+        if not glyph.isComposite() or len(glyph.components) < 2:
+            continue
+        # Components positioned by matching points have no offsets.
+        if any(not hasattr(c, "x") for c in glyph.components):
+            overlapping.add(name)
+            continue
+        for a, b in combinations(componentboxes(glyph), 2):
+            if a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]:
+                overlapping.add(name)
+                break
+    return overlapping
+
+
+def removedOverlaps(otf, names):
+    """Remove the overlaps of the given glyphs of otf, and return their new
+    glyf entries or charstring programs, or None for those that are
+    unchanged."""
+    from fontTools.ttLib.removeOverlaps import removeOverlaps
+
+    if "glyf" in otf:
+        glyphs = otf["glyf"]
+    else:
+        glyphs = otf["CFF "].cff.topDictIndex[0].CharStrings
+    before = [glyphs[name] for name in names]
+
+    removeOverlaps(otf, glyphNames=names)
+
+    results = []
+    for name, glyph in zip(names, before):
+        # Modified glyphs are replaced, not changed in place.
+        if glyphs[name] is glyph:
+            results.append(None)
+        elif "glyf" in otf:
+            results.append(glyphs[name])
+        else:
+            results.append(glyphs[name].program)
+    return results
+
+
+# Specialized charstring programs, keyed by the repr of the program since ints
+# and floats are encoded differently. Static instances and subsets built in
+# the same process share many identical programs (spaces, marks, figures, etc.).
+_specialized = {}
+_SPECIALIZED_MAX = 1 << 16
+
+
+def specializePrograms(programs):
+    """Return the specialized versions of the given charstring programs,
+    reusing the ones specialized before in this process."""
+    from fontTools.cffLib.specializer import specializeProgram
+
+    if len(_specialized) > _SPECIALIZED_MAX:
+        _specialized.clear()
+
+    keys = [repr(program) for program in programs]
+    for key, program in zip(keys, programs):
+        if key not in _specialized:
+            _specialized[key] = specializeProgram(program)
+
+    return [list(_specialized[key]) for key in keys]
+
+
+SUBROUTINIZATION_MODES = ("full", "incremental")
+
+# Configuration keys (and the command line selection) only used after the
+# checkpointed stages, changing them does not invalidate the checkpoints.
+CHECKPOINT_SKIP = (
+    "autohinting",
+    "compression",
+    "subroutinization",
+    "subsets",
+    "selection",
+)
+
+# Incremental subroutinization is only used when at most this fraction of the
+# glyphs changed since the last full run.
+_INCREMENTAL_MAX_CHANGED = 0.1
+
+
+def cffFrame(cff):
+    """Return a string describing everything in a CFF table but the
+    charstrings and the subroutines (and the font bounding box, which is
+    recalculated when compiling)."""
+    topDict = cff.topDictIndex[0]
+    skip = {"CharStrings", "charset", "Encoding", "Private", "FontBBox"}
+    items = [cff.fontNames]
+    items += [(n, getattr(topDict, n, None)) for n in topDict.order if n not in skip]
+    private = topDict.Private
+    items += [(n, getattr(private, n, None)) for n in private.order if n != "Subrs"]
+    return repr(items)
+
+
+def glyphHashes(charStrings):
+    """Hashes of the compiled charstrings."""
+    import hashlib
+
+    return {
+        name: hashlib.sha256(charStrings[name].bytecode).digest()
+        for name in charStrings.keys()
+    }
+
+
+def _hintbez(glyphs):
+    from psautohint import hint_bez_glyph
+
+    # The psautohint command line defaults: no outline changes, hint
+    # substitution and rounded coordinates.
+    with TemporaryLogLevel(logging.ERROR):
+        return [hint_bez_glyph(info, bez, False, True, True) for info, bez in glyphs]
+
+
+class GlyphCache:
+    """Per-glyph cache of pre-processed glyphs (decomposed, with overlaps
+    removed and converted to quadratic curves) and of their compiled glyf
+    entries or charstrings.
+
+    Glyphs are keyed by a hash of their own data and that of their components,
+    so only glyphs that changed since the previous build need to be processed
+    and compiled again. The cache is persisted in the build cache, one entry
+    per source and format (under `kind`, so it can hold other per-glyph data).
+    """
+
+    def __init__(self, cache, key, kind="glyphs"):
+        import pickle
+
+        self.cache = cache
+        self.key = key
+        self.kind = kind
+        data = cache.get(kind, key)
+        self.entries = pickle.loads(data) if data else {}
+        self.used = {}
+
+    def get(self, key):
+        import pickle
+
+        data = self.entries.get(key)
+        if data is None:
+            return None
+        self.used[key] = data
+        return pickle.loads(data)
+
+    def put(self, key, value):
+        import pickle
+
+        self.used[key] = pickle.dumps(value)
+
+    def save(self):
+        import pickle
+
+        # Only keep the glyphs used by this build, so that the entry does not
+        # grow with every edit.
+        self.cache.put(self.kind, self.key, pickle.dumps(self.used))
+
+    def compileroptions(self, preProcessorClass, outlineCompilerClass):
+        """Return ufo2ft compile options using subclasses of the given
+        pre-processor and outline compiler bound to this cache."""
+        from ufo2ft.preProcessor import BaseInterpolatablePreProcessor
+
+        if issubclass(preProcessorClass, BaseInterpolatablePreProcessor):
+            mixin = _CachingInterpolatablePreProcessor
+        else:
+            mixin = _CachingPreProcessor
+        return {
+            "preProcessorClass": type(
+                preProcessorClass.__name__,
+                (mixin, preProcessorClass),
+                {"glyphCache": self},
+            ),
+            "outlineCompilerClass": type(
+                outlineCompilerClass.__name__,
+                (_CachingOutlineCompiler, outlineCompilerClass),
+                {"glyphCache": self},
+            ),
+        }
+
+
+def _configkey(*args):
+    import re
+
+    # Strip object addresses from the representation, so that it is stable
+    # between runs.
+    return re.sub(r" at 0x[0-9a-f]+", "", repr(args)).encode("utf-8")
+
+
+def _glyphkeys(glyphSets, config):
+    """Return hash keys for the glyphs in glyphSets, covering the glyph in all
+    the glyph sets and, recursively, its components."""
+    import hashlib
+    import pickle
+
+    names = {name: None for glyphSet in glyphSets for name in glyphSet}
+    keys = {}
+
+    def key(name, seen=()):
+        if name in keys:
+            return keys[name]
+        hasher = hashlib.sha256(config)
+        bases = set()
+        for glyphSet in glyphSets:
+            glyph = glyphSet.get(name)
+            if glyph is None:
+                hasher.update(b"\0")
+                continue
+            hasher.update(pickle.dumps(glyph))
+            bases.update(c.baseGlyph for c in glyph.components)
+        for base in sorted(bases):
+            hasher.update(base.encode("utf-8"))
+            if base in names and base not in seen:
+                hasher.update(key(base, (*seen, name)).encode("utf-8"))
+        keys[name] = hasher.hexdigest()
+        return keys[name]
+
+    for name in names:
+        key(name)
+    return keys
+
+
+def _glyphclosure(glyphSets, names):
+    closure = set()
+    stack = list(names)
+    while stack:
+        name = stack.pop()
+        if name in closure:
+            continue
+        closure.add(name)
+        for glyphSet in glyphSets:
+            if name in glyphSet:
+                stack.extend(c.baseGlyph for c in glyphSet[name].components)
+    return closure
+
+
+def _cachedprocess(cache, glyphSets, config, process):
+    """Pre-process glyphSets using `process` only for the glyphs missing from
+    cache and their components, and take the rest from the cache."""
+    from copy import copy
+
+    keys = _glyphkeys(glyphSets, config)
+
+    results = {}
+    for name, key in keys.items():
+        glyphs = cache.get(key)
+        if glyphs is not None:
+            results[name] = glyphs
+
+    dirty = [name for name in keys if name not in results]
+    logger.info(f"Pre-processing {len(dirty)} of {len(keys)} glyphs")
+    if dirty:
+        closure = _glyphclosure(glyphSets, dirty)
+        reduced = []
+        for glyphSet in glyphSets:
+            new = copy(glyphSet)
+            new.clear()
+            new.update((n, g) for n, g in glyphSet.items() if n in closure)
+            reduced.append(new)
+        processed = process(reduced)
+        for name in dirty:
+            glyphs = [glyphSet.get(name) for glyphSet in processed]
+            cache.put(keys[name], glyphs)
+            results[name] = glyphs
+
+    for i, glyphSet in enumerate(glyphSets):
+        for name in keys:
+            glyph = results[name][i]
+            if glyph is None:
+                glyphSet.pop(name, None)
+            else:
+                glyphSet[name] = glyph
+        # Used by _CachingOutlineCompiler.
+        glyphSet.glyphKeys = {name: f"{key}:{i}" for name, key in keys.items()}
+
+    return glyphSets
+
+
+class _CachingPreProcessor:
+    glyphCache = None
+
+    def process(self):
+        # Custom filters can do anything, so we don’t cache their results.
+        if self.preFilters or self.postFilters:
+            return super().process()
+
+        def process(glyphSets):
+            (self.glyphSet,) = glyphSets
+            return [parent()]
+
+        parent = super().process
+        glyphSet = self.glyphSet
+        config = _configkey(type(self).__name__, [vars(f) for f in self.defaultFilters])
+        (self.glyphSet,) = _cachedprocess(self.glyphCache, [glyphSet], config, process)
+        return self.glyphSet
+
+
+class _CachingInterpolatablePreProcessor:
+    glyphCache = None
+
+    def process(self):
+        if any(self.preFilters) or any(self.postFilters):
+            return super().process()
+
+        def process(glyphSets):
+            self.glyphSets = glyphSets
+            self._update_instantiator()
+            return parent()
+
+        parent = super().process
+        glyphSets = self.glyphSets
+        config = _configkey(
+            type(self).__name__, [[vars(f) for f in fs] for fs in self.defaultFilters]
+        )
+        self.glyphSets = _cachedprocess(self.glyphCache, glyphSets, config, process)
+        self._update_instantiator()
+        return self.glyphSets
+
+
+class _CachingOutlineCompiler:
+    glyphCache = None
+
+    def _config(self):
+        settings = {
+            k: v
+            for k, v in vars(self).items()
+            if isinstance(v, (bool, int, float, str, type(None)))
+        }
+        if hasattr(self, "getDefaultAndNominalWidths"):
+            settings["widths"] = self.getDefaultAndNominalWidths()
+        return _configkey(type(self).__name__, sorted(settings.items())).hex()
+
+    def compileGlyphs(self):
+        import hashlib
+
+        keys = getattr(self.allGlyphs, "glyphKeys", None)
+        if keys is None:
+            return super().compileGlyphs()
+
+        config = self._config()
+        glyphKeys = {}
+        compiled = {}
+        for name in self.glyphOrder:
+            if name not in keys:
+                continue
+            key = hashlib.sha256(f"{config}:{keys[name]}".encode("utf-8"))
+            glyphKeys[name] = key.hexdigest()
+            glyph = self.glyphCache.get(glyphKeys[name])
+            if glyph is not None:
+                compiled[name] = glyph
+
+        glyphOrder = self.glyphOrder
+        self.glyphOrder = [name for name in glyphOrder if name not in compiled]
+        try:
+            new = super().compileGlyphs() if self.glyphOrder else {}
+        finally:
+            self.glyphOrder = glyphOrder
+        for name, glyph in new.items():
+            if name in glyphKeys:
+                self.glyphCache.put(glyphKeys[name], glyph)
+
+        compiled.update(new)
+        return {name: compiled[name] for name in glyphOrder}
+
+
+# Tables built by the outline compiler that feature files can modify.
+_FEATURE_MODIFIED_TABLES = ("head", "hhea", "vhea", "OS/2", "name")
+
+
+def _featurestate(ttFont):
+    import pickle
+
+    return {
+        tag: {k: pickle.dumps(v) for k, v in vars(ttFont[tag]).items()}
+        for tag in _FEATURE_MODIFIED_TABLES
+        if tag in ttFont
+    }
+
+
+class _SharedFeatureCompiler:
+    """Feature compiler mixin that compiles the features of each UFO only
+    once per build. The tables it adds, and the attributes it modifies in the
+    outline tables, are recorded so that compiling the UFO to another format
+    gets copies of them instead of running feaLib again.
+
+    With a `featureCache`, the compiled tables are also persisted, keyed by
+    the inputs of the feature compilation (feature file, kerning, groups,
+    glyph anchors, glyph order…), so that outline edits do not require
+    compiling the features again in later builds."""
+
+    sharedFeatures = None
+    featureCache = None
+
+    def _featurekey(self):
+        import hashlib
+
+        text = self.ufo.features.text or ""
+        hasher = hashlib.sha256()
+        if "include" in text:
+            # Hash the tokens of the features, which include the tokens of the
+            # included files.
+            tokens = self._featuretokens(text)
+            if tokens is None:
+                return None
+            for kind, token, _ in tokens:
+                hasher.update(repr((kind, token)).encode("utf-8"))
+        else:
+            hasher.update(text.encode("utf-8"))
+        hasher.update(
+            _configkey(
+                toolversions(),
+                type(self).__name__,
+                [(type(w).__name__, vars(w.options)) for w in self.featureWriters],
+                sorted(
+                    (k, sorted(v)) for k, v in (self.extraSubstitutions or {}).items()
+                ),
+                dict(self.ufo.lib),
+                dict(self.ufo.kerning),
+                {k: list(v) for k, v in self.ufo.groups.items()},
+            )
+        )
+        for name, glyph in self.glyphSet.items():
+            hasher.update(
+                _configkey(
+                    name,
+                    glyph.unicodes,
+                    [(a.name, a.x, a.y) for a in glyph.anchors],
+                    [(c.baseGlyph, tuple(c.transformation)) for c in glyph.components],
+                )
+            )
+        return hasher.hexdigest()
+
+    def _featuretokens(self, text):
+        """Return the tokens of the feature text, with the included files
+        resolved like ufo2ft.featureCompiler.parseLayoutFeatures() does, or
+        None if they can not be read."""
+        import io
+        import os
+
+        from fontTools.feaLib.error import FeatureLibError
+        from fontTools.feaLib.lexer import IncludingLexer
+
+        buf = io.StringIO(text)
+        includeDir = self.feaIncludeDir
+        if includeDir is None and self.ufo.path is not None:
+            path = os.path.normpath(self.ufo.path)
+            buf.name = os.path.join(path, "features.fea")
+            includeDir = os.path.dirname(path) or "."
+        includeDir = os.path.normpath(includeDir) if includeDir else None
+        try:
+            return list(IncludingLexer(buf, includeDir=includeDir))
+        except (FeatureLibError, OSError):
+            return None
+
+    def _reuse(self, shared, before):
+        """Add the recorded tables and changes to the font, if they were
+        recorded from the same outline tables."""
+        from copy import deepcopy
+
+        if not all(
+            before.get(tag, {}).get(k) == old
+            for tag, changes in shared["changes"].items()
+            for k, (old, _) in changes.items()
+        ):
+            return False
+        for tag, table in shared["tables"].items():
+            self.ttFont[tag] = deepcopy(table)
+        for tag, changes in shared["changes"].items():
+            for k, (_, value) in changes.items():
+                setattr(self.ttFont[tag], k, deepcopy(value))
+        return True
+
+    def _load(self, key):
+        import pickle
+
+        from fontTools.ttLib import newTable
+
+        data = self.featureCache.get("features", key)
+        if data is None:
+            return None
+        entry = pickle.loads(data)
+        tables = {}
+        for tag, data in entry["tables"].items():
+            tables[tag] = newTable(tag)
+            tables[tag].decompile(data, self.ttFont)
+        return {"tables": tables, "changes": entry["changes"]}
+
+    def _store(self, key, shared):
+        import pickle
+        from copy import deepcopy
+
+        # Compile copies, as compiling can modify the tables (e.g. to resolve
+        # offset overflows).
+        tables = {
+            tag: deepcopy(table).compile(self.ttFont)
+            for tag, table in shared["tables"].items()
+        }
+        entry = {"tables": tables, "changes": shared["changes"]}
+        self.featureCache.put("features", key, pickle.dumps(entry))
+
+    def compile(self):
+        from copy import deepcopy
+
+        glyphOrder = self.ttFont.getGlyphOrder()
+        before = _featurestate(self.ttFont)
+        shared = self.sharedFeatures.get(id(self.ufo))
+        if (
+            shared is not None
+            and shared["ufo"] is self.ufo
+            and shared["glyphOrder"] == glyphOrder
+            and self._reuse(shared, before)
+        ):
+            return self.ttFont
+
+        key = None
+        if self.featureCache is not None:
+            key = self._featurekey()
+        if key is not None:
+            shared = self._load(key)
+            if shared is not None and self._reuse(shared, before):
+                self.sharedFeatures[id(self.ufo)] = {
+                    **shared,
+                    "ufo": self.ufo,
+                    "glyphOrder": glyphOrder,
+                }
+                return self.ttFont
+
+        tags = set(self.ttFont.keys())
+        super().compile()
+        if not tags.issubset(self.ttFont.keys()):
+            return self.ttFont
+
+        after = _featurestate(self.ttFont)
+        changes = {}
+        for tag, state in after.items():
+            if tag not in before:
+                continue
+            for k, data in state.items():
+                if before[tag].get(k) != data:
+                    value = deepcopy(getattr(self.ttFont[tag], k))
+                    changes.setdefault(tag, {})[k] = (before[tag].get(k), value)
+        shared = {
+            "ufo": self.ufo,
+            "glyphOrder": glyphOrder,
+            "tables": {
+                tag: deepcopy(self.ttFont[tag])
+                for tag in self.ttFont.keys()
+                if tag not in tags
+            },
+            "changes": changes,
+        }
+        self.sharedFeatures[id(self.ufo)] = shared
+        if key is not None:
+            self._store(key, shared)
+        return self.ttFont
+
+
+@lru_cache(maxsize=None)
+def _parseglyphnames(path, mtime):
+    with open(path, "r") as f:
+        lines = f.read().split("\n")
+    lines = [line.split() for line in lines if line and not line.startswith("%")]
+    return {line[0]: line[1] for line in lines}
+
+
+def glyphNames(path):
+    """Return the final glyph names mapping of a .ren file. The file is parsed
+    once per process (unless it changes), and the mapping is shared: it must
+    be copied before being modified or stored."""
+    path = Path(path).resolve()
+    return _parseglyphnames(path, path.stat().st_mtime_ns)
+
+
+# UFOs kept loaded between the builds of a long-running process (see Watcher),
+# keyed by font and path, with a hash of their files but the glyphs. These are
+# released after each build, and parsed again from the .glif files when
+# accessed, so changed glyphs do not require loading the UFO again.
+_residentufos = {}
+
+
+def releaseGlyphs(ufo):
+    """Drop the glyphs loaded from a lazily opened UFO, they are parsed again
+    from the .glif files if accessed later. Only for UFOs whose glyphs were
+    not modified."""
+    from ufoLib2.objects import LayerSet
+
+    if ufo.reader is not None:
+        ufo.layers = LayerSet.read(ufo.reader, lazy=True)
+
+
 class Font:
     def __init__(self, name, conf, project):
         self.name = name
+        self.fontname = name
 
         # Merge keys from the top level (project) configuration into the
         # current font’s conf.
@@ -306,6 +1696,12 @@ class Font:
         self.meta = conf.get("meta", [])
 
         self.formats = [Format(f) for f in conf.get("formats", list(Format))]
+        self.compression = compressionSettings(conf.get("compression"))
+        self.subroutinization = conf.get("subroutinization", "full")
+        if self.subroutinization not in SUBROUTINIZATION_MODES:
+            raise RuntimeError(
+                f"Unsupported “subroutinization” value: “{self.subroutinization}”"
+            )
         self.fmt = None
 
         self.instances = conf.get("instances")
@@ -343,6 +1739,75 @@ class Font:
         self.autohinting = conf.get("autohinting", {})
         self.gasp = conf.get("gasp", {})
 
+        self.conf = conf
+        self.cache = None
+        self.resume = False
+        self.resident = False
+        # Formats and instances selected on the command line, None for all.
+        self.selectedformats = None
+        self.selectedinstances = None
+        self._resumekey = None
+        # PostScript and subfamily names of the designspace instances, loaded
+        # by hasinstance().
+        self._dsinstances = None
+
+    def _stage(self, name):
+        fmt = self.fmt.value if self.fmt else None
+        return profile(name, font=self.fontname, name=self.name, format=fmt)
+
+    def select(self, formats=None, instances=None):
+        """Build only the given formats (web formats are built from the given
+        outline formats, or from all of them, which are then not saved) and
+        the given static instances, skipping the variable font and subsets."""
+        if formats:
+            self.selectedformats = list(dict.fromkeys(formats))
+        if instances:
+            self.selectedinstances = list(instances)
+
+    def hasinstance(self, key):
+        """Whether `key` names this static font, or one of the static instances
+        of this variable font, as matched by select()."""
+        if not self.variable:
+            return key == self.name
+        if self.instances is None:
+            return False
+        if key in self.instances:
+            return True
+        # Instances with coordinates are only matched by their keys.
+        if self.instances and all(
+            isinstance(conf, dict) and "coordinates" in conf
+            for conf in self.instances.values()
+        ):
+            return False
+
+        # The fvar instances are named after the designspace ones.
+        if self._dsinstances is None:
+            from fontTools.designspaceLib import DesignSpaceDocument
+
+            ds = DesignSpaceDocument.fromfile(self.source)
+            self._dsinstances = [
+                (i.postScriptFontName, i.styleName) for i in ds.instances
+            ]
+        return any(namesMatch(key, *names) for names in self._dsinstances)
+
+    def _formatselected(self, fmt):
+        # Whether fmt is built, the web formats needing an outline format.
+        formats = self.selectedformats
+        if formats is None or fmt in formats:
+            return True
+        outline = (Format.TTF, Format.OTF)
+        return fmt in outline and not any(f in outline for f in formats)
+
+    def _derive(self, **kwargs):
+        """Return a copy of this font with the given attributes replaced, to be
+        used as the context of a single task (e.g. building an instance)."""
+        from copy import copy
+
+        font = copy(self)
+        for key, value in kwargs.items():
+            setattr(font, key, value)
+        return font
+
     @property
     def ext(self):
         return self.fmt.value
@@ -384,22 +1849,36 @@ class Font:
 
         return override
 
+    @stage("openufo")
     def _openufo(self, path, dspath=None):
         from ufoLib2 import Font as UFOFont
 
         if not path.exists() and dspath is not None:
             path = dspath.parent / path.name
 
-        ufo = UFOFont.open(path, validate=False)
+        ufo = None
+        if self.resident:
+            import hashlib
+
+            hasher = hashlib.sha256()
+            hashfiles(hasher, path, skip=".glif")
+            key = (self.name, path.resolve())
+            ufo, digest = _residentufos.get(key, (None, None))
+            if digest == hasher.hexdigest():
+                logger.info(f"Reusing loaded {path.name}")
+                releaseGlyphs(ufo)
+            else:
+                ufo = None
+
+        if ufo is None:
+            # Glyphs are parsed on first access, see also releaseGlyphs().
+            ufo = UFOFont.open(path, lazy=True, validate=False)
+            if self.resident:
+                _residentufos[key] = ufo, hasher.hexdigest()
 
         if self.ren is not None:
-            with open(self.ren, "r") as f:
-                logger.info(f"Setting {path.name} final glyph names")
-                lines = f.read().split("\n")
-                lines = [
-                    line.split() for line in lines if line and not line.startswith("%")
-                ]
-                ufo.lib[PSNAMES_KEY] = {line[0]: line[1] for line in lines}
+            logger.info(f"Setting {path.name} final glyph names")
+            ufo.lib[PSNAMES_KEY] = dict(glyphNames(self.ren))
 
         if "fstype" in self.set:
             ufo.info.openTypeOS2Type = self.set["fstype"]
@@ -417,6 +1896,7 @@ class Font:
 
         return ufo
 
+    @stage("featureparams")
     def _setfeatureparams(self, otf):
         if not self.featureparams:
             return
@@ -494,6 +1974,7 @@ class Font:
             logger.info(f"Adding default “STAT” table to {self.filename}")
             build_stat(font)
 
+    @stage("copytables")
     def _copytables(self, otf, otl):
         from fontTools.otlLib.maxContextCalc import maxCtxFont
 
@@ -513,6 +1994,7 @@ class Font:
             otf["meta"] = meta = newTable("meta")
             meta.data = {t: ",".join(v) for t, v in self.meta.items()}
 
+    @stage("postprocess")
     def _postprocess(self, otf):
         if self.DSIG:
             from fontTools.ttLib import newTable
@@ -529,6 +2011,7 @@ class Font:
 
         return otf
 
+    @stage("autohint")
     def _autohint(self, otf):
         if self.variable:
             return otf
@@ -544,8 +2027,6 @@ class Font:
 
             from io import BytesIO
 
-            from ttfautohint import ttfautohint
-
             opts = {"no-info": True, **conf}
             opts = {k.replace("-", "_"): v for k, v in opts.items()}
 
@@ -556,7 +2037,8 @@ class Font:
             buf = BytesIO()
             otf.save(buf)
             otf.close()
-            data = ttfautohint(in_buffer=buf.getvalue(), **opts)
+            with self._stage("ttfautohint"):
+                data = self._ttfautohint(buf.getvalue(), opts)
             otf = TTFont(BytesIO(data))
 
             # Set bit 3 on head.flags
@@ -570,91 +2052,353 @@ class Font:
 
             logger.info(f"Autohinting {self.filename}")
 
-            from tempfile import TemporaryDirectory
+            with TemporaryLogLevel(logging.ERROR), self._stage("psautohint"):
+                otf = self._psautohint(otf)
+        return otf
 
-            from psautohint.__main__ import main as psautohint
+    def _psautohint(self, otf):
+        """Return the font with its CFF glyphs hinted using the psautohint
+        library, taking the glyphs hinted with the same alignment zones and
+        stems before from the cache."""
+        from io import BytesIO
 
-            with TemporaryDirectory() as d:
-                path = Path(d) / "tmp.otf"
-                otf.save(path)
-                with TemporaryLogLevel(logging.ERROR):
-                    psautohint([str(path)])
-                otf.close()
-                otf = TTFont(path)
-        return otf
+        from psautohint.otfFont import CFFFontData
 
-    def _subset(self, otf):
-        from fontTools.subset import Options, Subsetter
+        # psautohint opens the font itself, from a file or a file object.
+        buf = BytesIO()
+        otf.save(buf)
+        otf.close()
+        buf.seek(0)
+        font = CFFFontData(buf, "OTF")
+        self._hintglyphs(font)
+        return font.ttFont
+
+    def _hintglyphs(self, font):
+        """Hint the glyphs of a psautohint font object in place."""
+        import hashlib
+
+        from psautohint import FontParseError
+        from psautohint.autohint import PsAutoHintCError
+
+        otf = font.ttFont
+        glyphs = {}
+        infos = {}
+        try:
+            for name in otf.getGlyphOrder():
+                bez = font.convertToBez(name, False, True)
+                if bez is None or "mt" not in bez:
+                    continue
+                index = font.getfdIndex(name)
+                if index not in infos:
+                    fdDict = font.getFontInfo(False, False, [], [], index)
+                    infos[index] = fdDict.getFontInfo()
+                glyphs[name] = (infos[index], bez)
+        except FontParseError as e:
+            logger.error(f"Can’t autohint {self.filename}: {e}")
+            return
+
+        glyphCache = None
+        if self.cache is not None:
+            from importlib.metadata import version
+
+            key = f"{self.source.resolve()}:{self.filename}:{version('psautohint')}"
+            key = hashlib.sha256(key.encode("utf-8")).hexdigest()
+            glyphCache = GlyphCache(self.cache, key, "psautohint")
+
+        hinted = {}
+        keys = {}
+        for name, (info, bez) in glyphs.items():
+            if glyphCache is not None:
+                key = hashlib.sha256(f"{info}\0{bez}".encode("utf-8")).hexdigest()
+                keys[name] = key
+                hinted[name] = glyphCache.get(key)
 
+        missing = [name for name in glyphs if hinted.get(name) is None]
+        try:
+            results = _hintbez([glyphs[n] for n in missing])
+        except PsAutoHintCError:
+            logger.error(
+                f"Can’t autohint {self.filename}: Failure in processing outline data."
+            )
+            return
+        for name, bez in zip(missing, results):
+            hinted[name] = bez
+            if glyphCache is not None:
+                glyphCache.put(keys[name], bez)
+        if glyphCache is not None:
+            glyphCache.save()
+
+        for name, bez in hinted.items():
+            # Like psautohint, leave glyphs that got no hints alone.
+            if any(op in bez for op in ("ry", "rb", "rm", "rv")):
+                font.updateFromBez(bez, name)
+
+    def _ttfautohint(self, data, opts):
+        """Run ttfautohint on the font data, taking the result from the cache
+        if the same data was hinted with the same options before."""
+        from ttfautohint import ttfautohint
+
+        if self.cache is None:
+            return ttfautohint(in_buffer=data, **opts)
+
+        import hashlib
+        import json
+        from importlib.metadata import version
+
+        hasher = hashlib.sha256()
+        hasher.update(version("ttfautohint-py").encode("utf-8"))
+        hasher.update(json.dumps(_canonical(opts)).encode("utf-8"))
+        for key in ("control_file", "reference_file"):
+            if opts.get(key) is not None:
+                hashfiles(hasher, opts[key])
+        hasher.update(data)
+        key = hasher.hexdigest()
+
+        hinted = self.cache.get("ttfautohint", key)
+        if hinted is None:
+            hinted = ttfautohint(in_buffer=data, **opts)
+            self.cache.put("ttfautohint", key, hinted)
+        return hinted
+
+    @stage("subset")
+    def _subset(self, otf):
+        if not self.subsets:
+            return []
+
+        # Each subset loads its own copy of the font from a snapshot.
+        key = f"{self.filename}:subset:{id(otf)}"
+        snapshot = FontSnapshot(otf)
+        calls = self._subsetcalls(otf, key)
+        return [path for call in calls for path in _snapshotcall(key, snapshot, call)]
+
+    def _subsetcalls(self, otf, key):
+        """Return the calls building the subsets of otf, from its snapshot
+        shared as `key`."""
+        from functools import partial
+
+        from fontTools.subset import Options
+
+        options = Options()
+        options.name_legacy = True
+        options.name_languages = ["*"]
+        options.recommended_glyphs = True
+        options.layout_features = ["*"]
+        options.notdef_outline = True
+        options.notdef_glyph = True
+        options.glyph_names = True
+        options.hinting = True
+        options.legacy_kern = True
+        options.symbol_cmap = True
+        options.layout_closure = False
+        options.prune_unicode_ranges = True
+        options.prune_codepage_ranges = True
+        options.passthrough_tables = False
+        options.recalc_average_width = True
+        options.ignore_missing_glyphs = True
+
+        options.drop_tables.remove("DSIG")
+        options.no_subset_tables += ["DSIG", "meta"]
+
+        options.name_IDs = [n.nameID for n in otf["name"].names if n.nameID < 256]
+
+        calls = []
         for name, subset in self.subsets.items():
-            with SaveState(self):
-                self.name = name
-                logger.info(f"Creating {self.filename} subset")
-                new = deepcopy(otf)
-                options = Options()
-                options.name_legacy = True
-                options.name_languages = ["*"]
-                options.recommended_glyphs = True
-                options.layout_features = ["*"]
-                options.notdef_outline = True
-                options.notdef_glyph = True
-                options.glyph_names = True
-                options.hinting = True
-                options.legacy_kern = True
-                options.symbol_cmap = True
-                options.layout_closure = False
-                options.prune_unicode_ranges = True
-                options.prune_codepage_ranges = True
-                options.passthrough_tables = False
-                options.recalc_average_width = True
-                options.ignore_missing_glyphs = True
-                options.layout_scripts = subset["langsys"]
-
-                options.drop_tables.remove("DSIG")
-                options.no_subset_tables += ["DSIG", "meta"]
-
-                options.name_IDs = [
-                    n.nameID for n in otf["name"].names if n.nameID < 256
-                ]
-
-                subsetter = Subsetter(options=options)
-                subsetter.populate(subset["glyphlist"])
-
-                with TemporaryLogLevel(logging.WARNING):
-                    subsetter.subset(new)
-
-                self.names = subset.get("names", {})
-                self.instances = subset.get("instances")
-                self.meta = subset.get("meta")
-                self._overridecmap(new, subset.get("cmapoverride"))
-                new = self._optimize(new)
-                self._setnames(new)
-                self._setmeta(new)
-                self._instanciate(new)
-                self._addvfsuffix(new)
-                self._buildwoff(new)
-                self._save(new)
+            font = self._derive(
+                name=name,
+                names=subset.get("names", {}),
+                instances=subset.get("instances"),
+                meta=subset.get("meta"),
+            )
+            calls.append(partial(font._buildsubset, key, subset, options))
 
-    def _removeoverlaps(self, otf):
-        from fontTools.ttLib.removeOverlaps import removeOverlaps
+        return calls
 
+    @stage("buildsubset")
+    def _buildsubset(self, key, subset, options):
+        from copy import copy
+
+        from fontTools.subset import Subsetter
+
+        logger.info(f"Creating {self.filename} subset")
+        otf = _snapshots[key].open()
+
+        options = copy(options)
+        options.layout_scripts = subset["langsys"]
+        subsetter = Subsetter(options=options)
+        subsetter.populate(subset["glyphlist"])
+
+        with TemporaryLogLevel(logging.WARNING):
+            subsetter.subset(otf)
+
+        self._overridecmap(otf, subset.get("cmapoverride"))
+        otf = self._optimize(otf)
+        self._setnames(otf)
+        self._setmeta(otf)
+        saved = self._instanciate(otf)
+        self._addvfsuffix(otf)
+        saved += self._buildwoff(otf)
+        saved += self._saveselected(otf)
+        return saved
+
+    @stage("removeoverlaps")
+    def _removeoverlaps(self, otf):
         logger.info(f"Removing overlaps from {self.filename}")
-        try:
-            removeOverlaps(otf)
-        except NotImplementedError:
-            pass
+        if "glyf" in otf:
+            self._removeglyfoverlaps(otf)
+        elif "CFF " in otf:
+            self._removecffoverlaps(otf)
         return otf
 
+    def _overlapresults(self, otf, names, keys):
+        """Remove the overlaps of the given glyphs of otf, and return the
+        results of removedOverlaps, reusing those cached under the given
+        keys."""
+        import hashlib
+
+        glyphCache = None
+        if self.cache is not None:
+            key = f"{self.source.resolve()}:{self.filename}"
+            key = hashlib.sha256(key.encode("utf-8")).hexdigest()
+            glyphCache = GlyphCache(self.cache, key, "overlaps")
+
+        results = [None] * len(names)
+        todo = []
+        for i, key in enumerate(keys):
+            cached = glyphCache.get(key) if glyphCache is not None else None
+            if cached is None:
+                todo.append(i)
+            else:
+                (results[i],) = cached
+
+        new = removedOverlaps(otf, [names[i] for i in todo])
+        for i, result in zip(todo, new):
+            results[i] = result
+            if glyphCache is not None:
+                glyphCache.put(keys[i], (result,))
+        if glyphCache is not None:
+            glyphCache.save()
+        return results
+
+    def _removeglyfoverlaps(self, otf):
+        """Same as fontTools.ttLib.removeOverlaps.removeOverlaps, but the
+        simple glyphs are cached, and composites whose component boxes do not
+        intersect are skipped."""
+        import hashlib
+
+        from fontTools.ttLib.removeOverlaps import removeOverlaps
+
+        glyf = otf["glyf"]
+        hmtx = otf["hmtx"]
+        glyphOrder = otf.getGlyphOrder()
+
+        # Simple glyphs do not depend on each other.
+        names, keys = [], []
+        for name in sorted(glyphOrder):
+            glyph = glyf[name]
+            if glyph.numberOfContours > 0:
+                offset = hmtx[name][1] - glyph.xMin if hasattr(glyph, "xMin") else 0
+                names.append(name)
+                key = hashlib.sha256(repr((offset, glyph.endPtsOfContours)).encode())
+                key.update(bytes(glyph.flags))
+                key.update(glyph.coordinates.array.tobytes())
+                keys.append(key.hexdigest())
+            elif not glyph.isComposite():
+                glyph.removeHinting()
+
+        # The advances are not part of the keys, so only the glyphs are
+        # cached and the side bearings set here, like removeOverlaps does.
+        results = self._overlapresults(otf, names, keys)
+        for name, glyph in zip(names, results):
+            if glyph is None:
+                glyf[name].removeHinting()
+                continue
+            glyf[name] = glyph
+            width, lsb = hmtx[name]
+            if lsb != glyph.xMin:
+                hmtx[name] = (width, glyph.xMin)
+
+        # Composites, after their components (removeOverlaps sorts them by
+        # increasing depth).
+        composites = [name for name in glyphOrder if glyf[name].isComposite()]
+        candidates = overlappingComposites(glyf, composites)
+        for name in composites:
+            if name not in candidates:
+                glyf[name].removeHinting()
+        removeOverlaps(otf, glyphNames=[n for n in composites if n in candidates])
+
+    def _removecffoverlaps(self, otf):
+        """Same as fontTools.ttLib.removeOverlaps.removeOverlaps, but the
+        glyphs are cached."""
+        import hashlib
+
+        from fontTools.misc.psCharStrings import T2CharString
+        from fontTools.pens.recordingPen import RecordingPen
+
+        cff = otf["CFF "].cff
+        charStrings = cff[0].CharStrings
+        glyphSet = otf.getGlyphSet()
+
+        names, keys = [], []
+        for name in otf.getGlyphOrder():
+            pen = RecordingPen()
+            glyphSet[name].draw(pen)
+            if not pen.value:
+                continue
+            charString = charStrings[name]
+            private = charString.private
+            width = None
+            if charString.width != private.defaultWidthX:
+                width = charString.width - private.nominalWidthX
+            names.append(name)
+            keys.append(hashlib.sha256(repr((pen.value, width)).encode()).hexdigest())
+
+        results = self._overlapresults(otf, names, keys)
+        modified = False
+        for name, program in zip(names, results):
+            if program is not None:
+                charString = charStrings[name]
+                charStrings[name] = T2CharString(
+                    program=program,
+                    private=charString.private,
+                    globalSubrs=charString.globalSubrs,
+                )
+                modified = True
+
+        # As removeOverlaps does when any glyph is modified.
+        if modified:
+            cff.remove_hints()
+            cff.remove_unused_subroutines()
+
+    def _decomposeoverlapping(self, otf):
+        from fontTools.ttLib.removeOverlaps import removeTTGlyphOverlaps
+
+        glyf = otf["glyf"]
+        hmtx = otf["hmtx"]
+        glyphSet = otf.getGlyphSet()
+        glyphOrder = otf.getGlyphOrder()
+        # Composites whose component boxes do not intersect are left as is by
+        # removeTTGlyphOverlaps, so only check the others.
+        candidates = overlappingComposites(glyf, glyphOrder)
+        for name in glyphOrder:
+            if name in candidates:
+                removeTTGlyphOverlaps(name, glyphSet, glyf, hmtx, False)
+
+    @stage("instanciate")
     def _instanciate(self, vf):
         if self.instances is None or not self.variable:
-            return
+            return []
 
-        from io import BytesIO
+        # Compile the variable font only once, each instance loads its own copy
+        # from the snapshot.
+        key = f"{self.filename}:{id(vf)}"
+        snapshot = FontSnapshot(vf)
+        calls = self._instancecalls(vf, key)
+        return [path for call in calls for path in _snapshotcall(key, snapshot, call)]
 
-        from fontTools.ttLib import TTFont
-        from fontTools.varLib.instancer import setRibbiBits
-        from fontTools.varLib.instancer.names import pruningUnusedNames, updateNameTable
-        from fontTools.varLib.mutator import instantiateVariableFont
+    def _instancecalls(self, vf, key):
+        """Return the calls building the static instances of vf, from its
+        snapshot shared as `key`."""
+        from functools import partial
 
         logger.info(f"Instancing {self.filename} statics")
         instances = []
@@ -662,24 +2406,71 @@ class Font:
             for instance in vf["fvar"].instances:
                 name = instanceName(self.name, instance, vf)
                 conf = {"name": name.replace(" ", "")}
-                instances.append((instance.coordinates, conf))
+                if self._instanceselected(conf["name"], instance, vf):
+                    instances.append((instance.coordinates, conf))
         else:
-            for key, conf in self.instances.items():
+            for name, conf in self.instances.items():
                 conf = conf if isinstance(conf, dict) else {}
-                conf["name"] = key
+                conf["name"] = name
                 if "coordinates" in conf:
-                    instances.append((conf["coordinates"], conf))
+                    if self._instanceselected(name, None, vf):
+                        instances.append((conf["coordinates"], conf))
                     continue
                 for instance in vf["fvar"].instances:
-                    if instanceMatch(key, instance, vf):
-                        instances.append((instance.coordinates, conf))
+                    if instanceMatch(name, instance, vf):
+                        if self._instanceselected(name, instance, vf):
+                            instances.append((instance.coordinates, conf))
                         break
 
+        if not instances:
+            if self.selectedinstances is not None:
+                logger.warning(f"No {self.filename} instance is selected")
+            return []
+
+        calls = []
         for coordinates, conf in instances:
-            stream = BytesIO()
-            vf.save(stream)
-            stream.seek(0)
-            otf = TTFont(stream)
+            instance = self._derive(
+                name=conf["name"],
+                variable=False,
+                STAT=None,
+                names=conf.get("names", {}),
+            )
+            calls.append(partial(instance._buildinstance, key, coordinates))
+
+        return calls
+
+    def _instanceselected(self, name, instance, vf):
+        """Whether the instance `name`, of the fvar `instance` if any, is
+        selected for building, matching it as the “instances” keys."""
+        if self.selectedinstances is None:
+            return True
+        for key in self.selectedinstances:
+            if key == name:
+                return True
+            if instance is not None and instanceMatch(key, instance, vf):
+                return True
+        return False
+
+    @stage("instance")
+    def _buildinstance(self, key, coordinates):
+        from fontTools.varLib.instancer import setRibbiBits
+        from fontTools.varLib.instancer.names import pruningUnusedNames, updateNameTable
+        from fontTools.varLib.mutator import instantiateVariableFont
+
+        # Resume from the instance before hinting, keyed by the VF it is
+        # instanced from.
+        checkpoint = None
+        if self._resumekey is not None:
+            import hashlib
+
+            vfhash = hashlib.sha256(_snapshots[key].data).hexdigest()
+            inputs = (vfhash, coordinates, self.names)
+            checkpoint = self._checkpointkey("instance", *inputs)
+        restored = self._loadcheckpoint(checkpoint)
+        if restored is not None:
+            (otf,) = restored
+        else:
+            otf = _snapshots[key].open()
 
             # Remove Variations PS Name Prefix, and do so before updating the
             # name table so it does not leak into the instance PS name.
@@ -690,28 +2481,25 @@ class Font:
             except ValueError:
                 pass
 
-            with SaveState(self):
-                self.name = conf["name"]
-                logger.info(f"Instancing {self.filename}")
-                self.variable = False
-                self.STAT = None
-                with pruningUnusedNames(otf):
-                    if "CFF2" in otf:
+            logger.info(f"Instancing {self.filename}")
+            with pruningUnusedNames(otf):
+                if "CFF2" in otf:
+                    with self._stage("instantiateCFF2"):
                         otf = instantiateCFF2(otf, coordinates)
+                with self._stage("instantiate"):
                     otf = instantiateVariableFont(otf, coordinates, inplace=True)
-                setRibbiBits(otf)
-                self.names = conf.get("names", {})
-                drop_typo_names = (1 in self.names and 2 in self.names) or False
-                otf = self._setnames(
-                    otf, fix_psname=True, drop_typo_names=drop_typo_names
-                )
-                otf = self._postprocess(otf)
-                otf = self._removeoverlaps(otf)
-                otf = self._autohint(otf)
-                otf = self._optimize(otf)
-                self._save(otf)
-                self._buildwoff(otf)
+            setRibbiBits(otf)
+            drop_typo_names = (1 in self.names and 2 in self.names) or False
+            otf = self._setnames(otf, fix_psname=True, drop_typo_names=drop_typo_names)
+            otf = self._postprocess(otf)
+            otf = self._removeoverlaps(otf)
+            (otf,) = self._savecheckpoint(checkpoint, [otf])
+
+        otf = self._autohint(otf)
+        otf = self._optimize(otf)
+        return [*self._saveselected(otf), *self._buildwoff(otf)]
 
+    @stage("setnames")
     def _setnames(self, font, fix_psname=False, drop_typo_names=False):
         font["name"].names = [n for n in font["name"].names if n.platformID == 3]
         if not self.names and not fix_psname:
@@ -768,6 +2556,7 @@ class Font:
 
         return font
 
+    @stage("optimize")
     def _optimize(self, otf):
         if self.variable:
             return otf
@@ -780,20 +2569,123 @@ class Font:
             return otf
 
         import cffsubr
-        from fontTools.cffLib.specializer import specializeProgram
 
         logger.info(f"Optimizing {self.filename}")
-        topDict = otf[tag].cff.topDictIndex[0]
-        charStrings = topDict.CharStrings
-        for charString in charStrings.values():
-            charString.decompile()
-            charString.program = specializeProgram(charString.program)
+        with self._stage("specialize"):
+            topDict = otf[tag].cff.topDictIndex[0]
+            charStrings = list(topDict.CharStrings.values())
+            for charString in charStrings:
+                charString.decompile()
+            programs = [charString.program for charString in charStrings]
+            programs = specializePrograms(programs)
+            for charString, program in zip(charStrings, programs):
+                charString.program = program
 
         logger.info(f"Subroutinizing {self.filename}")
-        cffsubr.subroutinize(otf, keep_glyph_names=False, cff_version=1)
+        with self._stage("subroutinize"):
+            if self.cache is None:
+                cffsubr.subroutinize(otf, keep_glyph_names=False, cff_version=1)
+            else:
+                self._subroutinize(otf, tag)
 
         return otf
 
+    def _subroutinize(self, otf, tag):
+        """Subroutinize like cffsubr.subroutinize(), taking the results of
+        previous runs from the cache.
+
+        The exact results are keyed by a hash of the CFF table. In incremental
+        mode, when only a few glyphs changed since the last full run of this
+        font, its subroutines are reused and only the changed glyphs are left
+        unsubroutinized."""
+        import hashlib
+        import pickle
+
+        import cffsubr
+        from fontTools.ttLib import newTable
+
+        # Decompile the glyph order before the CFF table is replaced. Compiling
+        # the table also compiles the charstrings, for glyphHashes().
+        otf.getGlyphOrder()
+        data = otf[tag].compile(otf)
+        key = hashlib.sha256(tag.encode("utf-8") + data).hexdigest()
+        last = f"{self.source.resolve()}:{self.filename}"
+        last = hashlib.sha256(last.encode("utf-8")).hexdigest()
+
+        cff = None
+        subroutinized = self.cache.get("subroutinized", key)
+        if subroutinized is None and self.subroutinization == "incremental":
+            cff = self._reusesubroutines(otf, tag, last)
+        if cff is None:
+            if subroutinized is None:
+                entry = None
+                if tag == "CFF ":
+                    charStrings = otf[tag].cff.topDictIndex[0].CharStrings
+                    entry = {
+                        "frame": cffFrame(otf[tag].cff),
+                        "glyphs": glyphHashes(charStrings),
+                    }
+                cffsubr.subroutinize(otf, keep_glyph_names=False, cff_version=1)
+                subroutinized = otf["CFF "].compile(otf)
+                self.cache.put("subroutinized", key, subroutinized)
+                if entry is not None:
+                    entry["data"] = subroutinized
+                    self.cache.put("subroutinized", last, pickle.dumps(entry))
+                return
+            cff = newTable("CFF ")
+            cff.decompile(subroutinized, otf)
+
+        del otf[tag]
+        otf["CFF "] = cff
+        if tag == "CFF2":
+            cffsubr.set_post_table_format(otf, 3.0)
+
+    def _reusesubroutines(self, otf, tag, key):
+        import pickle
+
+        from fontTools.cffLib.specializer import commandsToProgram, programToCommands
+        from fontTools.misc.psCharStrings import T2CharString
+        from fontTools.ttLib import newTable
+
+        data = self.cache.get("subroutinized", key)
+        if tag != "CFF " or data is None:
+            return None
+
+        entry = pickle.loads(data)
+        charStrings = otf[tag].cff.topDictIndex[0].CharStrings
+        if list(charStrings.keys()) != list(entry["glyphs"]):
+            return None
+        if cffFrame(otf[tag].cff) != entry["frame"]:
+            return None
+        hashes = glyphHashes(charStrings)
+        changed = [n for n, h in hashes.items() if h != entry["glyphs"][n]]
+        if len(changed) > len(hashes) * _INCREMENTAL_MAX_CHANGED:
+            return None
+
+        logger.info(f"Reusing subroutines of {self.filename} ({len(changed)} changed)")
+        cff = newTable("CFF ")
+        cff.decompile(entry["data"], otf)
+        topDict = cff.cff.topDictIndex[0]
+        private = topDict.Private
+        hmtx = otf["hmtx"]
+        for name in changed:
+            charString = charStrings[name]
+            charString.decompile()
+            # tx optimizes the default and nominal widths, so encode the
+            # widths relative to its ones.
+            commands = programToCommands(charString.program)
+            if commands and commands[0][0] == "":
+                commands.pop(0)
+            width = hmtx[name][0]
+            if width != private.defaultWidthX:
+                commands.insert(0, ("", [width - private.nominalWidthX]))
+            topDict.CharStrings[name] = T2CharString(
+                program=commandsToProgram(commands),
+                private=private,
+                globalSubrs=cff.cff.GlobalSubrs,
+            )
+        return cff
+
     def _addvfsuffix(self, otf):
         names = {}
 
@@ -842,44 +2734,255 @@ class Font:
                         )
                     subtable.cmap[code] = glyphname
 
+    @stage("buildwoff")
     def _buildwoff(self, otf):
-        for fmt in self.formats:
-            if fmt not in (Format.WOFF, Format.WOFF2):
-                continue
-            new = deepcopy(otf)
+        from concurrent.futures import ThreadPoolExecutor
+
+        flavors = [
+            f
+            for f in self.formats
+            if f in (Format.WOFF, Format.WOFF2) and self._formatselected(f)
+        ]
+        if not flavors:
+            return []
+
+        # Serialize the font once and load each flavor from the same bytes,
+        # tables are then copied as is and only compressed. zlib and brotli
+        # release the GIL, so the flavors are compressed concurrently.
+        snapshot = FontSnapshot(otf)
+
+        def save(fmt):
+            new = snapshot.open()
             new.flavor = fmt.value
-            self._save(new, fmt)
+            return self._save(new, fmt)
+
+        with compression(self.compression), ThreadPoolExecutor(len(flavors)) as pool:
+            return list(pool.map(save, flavors))
 
+    @stage("save")
     def _save(self, otf, wfmt=None):
-        fmt = self.fmt
-        fmtdir = fmt.name
+        fmtdir = self.fmt.name
         if self.variable:
             fmtdir += "VF"
+        filename = self.filename
         if wfmt is not None:
             fmtdir += wfmt.name
-            self.fmt = wfmt
+            filename = f"{self.name}.{wfmt.value}"
         parent = self.output / self.name.split("-")[0] / fmtdir
         parent.mkdir(parents=True, exist_ok=True)
-        path = parent / self.filename
+        path = parent / filename
         logger.info(f"Saving {path}")
         otf.save(path)
-        self.fmt = fmt
+        return path
+
+    def _saveselected(self, otf):
+        """Save the font if its outline format is selected, and return the
+        saved paths."""
+        if self.selectedformats is not None and self.fmt not in self.selectedformats:
+            return []
+        return [self._save(otf)]
+
+    def build(self, scheduler):
+        """Add the tasks building this font to scheduler."""
+        from functools import partial
 
-    def build(self):
         logger.info(f"Building {self.name}")
-        with SaveState(self):
+
+        key = None
+        if self.cache is not None:
+            key = self._cachekey()
+            if self._restore(key):
+                return
+            if self.resume:
+                self._resumekey = self._cachekey(skip=CHECKPOINT_SKIP)
+
+        # The sources are compiled in a worker (but resident ones, which stay
+        # loaded in this process), then the tasks building the outputs from
+        # the compiled fonts are added, and the outputs cached once built.
+        if self.variable:
+            formats = [f for f in self.formats if f in (Format.TTF, Format.OTF)]
+        else:
+            formats = [Format.TTF, Format.OTF]
+        formats = [f for f in formats if self._formatselected(f)]
+
+        compiled = scheduler.add(
+            self._buildvariable if self.variable else self._buildstatic,
+            formats,
+            local=self.resident,
+            memory=self._sourcememory(),
+            group=self.fontname,
+        )
+
+        def schedule(snapshots):
+            tasks = []
+            for fmt, snapshot in zip(formats, snapshots):
+                font = self._derive(fmt=fmt)
+                if self.variable:
+                    tasks += font._variabletasks(snapshot, scheduler)
+                else:
+                    tasks.append(font._statictask(snapshot, scheduler))
+            if key is not None:
+                scheduler.add(
+                    partial(self._cacheoutputs, key),
+                    inputs=tasks,
+                    local=True,
+                    group=self.fontname,
+                )
+
+        scheduler.add(schedule, inputs=[compiled], local=True, group=self.fontname)
+
+    def _sourcememory(self):
+        """Return the estimated peak memory of compiling the sources."""
+        stamps = fileStamps(self._sources())
+        size = sum(stamp[1] for stamp in stamps.values() if stamp is not None)
+        return size * SOURCE_TASK_MEMORY
+
+    def _cacheoutputs(self, key, *saved):
+        files = {
+            path.relative_to(self.output): path for paths in saved for path in paths
+        }
+        self.cache.putfiles("output", key, files)
+
+    def _cachekey(self, skip=()):
+        """Hash of everything the outputs of this font depend on: the resolved
+        configuration (but the `skip` keys), the source files, the builder
+        itself and the versions of the tools it uses."""
+        import hashlib
+        import json
+        import os
+
+        conf = {k: v for k, v in self.conf.items() if k not in skip}
+        hasher = hashlib.sha256()
+        hasher.update(Path(__file__).read_bytes())
+        hasher.update(json.dumps(_canonical(conf)).encode("utf-8"))
+        if "subsets" not in skip:
+            hasher.update(json.dumps(_canonical(self.subsets)).encode("utf-8"))
+        if "selection" not in skip and (
+            self.selectedformats is not None or self.selectedinstances is not None
+        ):
+            formats = self.selectedformats and [f.value for f in self.selectedformats]
+            selection = {"formats": formats, "instances": self.selectedinstances}
+            hasher.update(json.dumps(selection).encode("utf-8"))
+        hasher.update(json.dumps(toolversions()).encode("utf-8"))
+        # Timestamps in the outputs depend on it.
+        hasher.update(os.environ.get("SOURCE_DATE_EPOCH", "").encode("utf-8"))
+
+        for source in self._sources():
+            hashfiles(hasher, source)
+
+        return hasher.hexdigest()
+
+    def _sources(self):
+        """The source files and directories of this font."""
+        sources = [self.source]
+        if self.variable:
+            from fontTools.designspaceLib import DesignSpaceDocument
+
+            ds = DesignSpaceDocument.fromfile(self.source)
+            for source in ds.sources:
+                path = Path(source.path)
+                if not path.exists():
+                    path = self.source.parent / path.name
+                sources.append(path)
+        if self.ren is not None:
+            sources.append(self.ren)
+        if "source" in self.ttf:
             if self.variable:
-                self._buildvariable()
+                sources += self.ttf["source"]
             else:
-                self._buildstatic()
+                sources.append(self.ttf["source"])
+        for key in ("control-file", "reference-file"):
+            path = self.autohinting.get("ttfautohint", {}).get(key)
+            if path is not None:
+                sources.append(Path(path))
 
-    def _buildvariable(self):
+        return sources
+
+    def _checkpointkey(self, stage, *inputs):
+        """Key of the checkpoint of a stage of this font and format, or None
+        when not resuming."""
+        if self._resumekey is None:
+            return None
+
+        import hashlib
+
+        key = f"{self._resumekey}:{stage}:{self.fmt.value}:{self.name}:{inputs!r}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _loadcheckpoint(self, key):
+        """Return the fonts of the checkpoint, or None."""
+        if key is None:
+            return None
+
+        import pickle
+        from io import BytesIO
+
+        from fontTools.ttLib import TTFont
+
+        data = self.cache.get("checkpoints", key)
+        if data is None:
+            return None
+        logger.info(f"Resuming {self.filename} from checkpoint")
+        return [TTFont(BytesIO(d)) for d in pickle.loads(data)]
+
+    def _savecheckpoint(self, key, fonts):
+        """Save the fonts as a checkpoint, and return copies of them loaded
+        back, so that the rest of the build is the same whether it resumes or
+        not."""
+        if key is None:
+            return fonts
+
+        import pickle
+
+        snapshots = [FontSnapshot(font) for font in fonts]
+        data = pickle.dumps([snapshot.data for snapshot in snapshots])
+        self.cache.put("checkpoints", key, data)
+        return [snapshot.open() for snapshot in snapshots]
+
+    def _glyphcache(self):
+        if self.cache is None:
+            return None
+
+        import hashlib
+
+        key = f"{self.source.resolve()}:{self.fmt.value}"
+        return GlyphCache(self.cache, hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+    def _featureoptions(self, ufos):
+        """ufo2ft options sharing the compiled features of the UFOs between
+        the formats of this build."""
+        from ufo2ft.constants import MTI_FEATURES_PREFIX
+        from ufo2ft.featureCompiler import FeatureCompiler
+
+        if any(
+            fn.startswith(MTI_FEATURES_PREFIX) and fn.endswith(".mti")
+            for ufo in ufos
+            for fn in ufo.data.fileNames
+        ):
+            return {}
+        return {
+            "featureCompilerClass": type(
+                FeatureCompiler.__name__,
+                (_SharedFeatureCompiler, FeatureCompiler),
+                {"sharedFeatures": {}, "featureCache": self.cache},
+            )
+        }
+
+    def _restore(self, key):
+        entry = self.cache.getfiles("output", key)
+        if entry is None:
+            return False
+
+        for path in sorted(p for p in entry.rglob("*") if p.is_file()):
+            dest = self.output / path.relative_to(entry)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            logger.info(f"Restoring {dest} from cache")
+            shutil.copyfile(path, dest)
+        return True
+
+    def _buildvariable(self, formats):
+        """Build the VF of each format, and return their snapshots."""
         from fontTools.designspaceLib import DesignSpaceDocument
-        from fontTools.varLib import build as buildvf
-        from ufo2ft import (
-            compileInterpolatableOTFsFromDS,
-            compileInterpolatableTTFsFromDS,
-        )
 
         ds = DesignSpaceDocument.fromfile(self.source)
         ds.loadSourceFonts(lambda p: self._openufo(Path(p), self.source))
@@ -887,17 +2990,69 @@ class Font:
         options = {"inplace": False}
         if {"GDEF", "GSUB", "GPOS"}.issubset(self.ttf.get("tables", {})):
             options["featureWriters"] = []
+        options.update(self._featureoptions([s.font for s in ds.sources]))
 
-        for fmt in self.formats:
-            self.fmt = fmt
-            if fmt == Format.TTF:
-                compileFont = compileInterpolatableTTFsFromDS
-            elif fmt == Format.OTF:
-                compileFont = compileInterpolatableOTFsFromDS
-            else:
-                continue
+        # Both formats are built in the same task, as they share the loaded
+        # sources and compiled features.
+        snapshots = []
+        with SaveState(self), self._stage("font"):
+            for fmt in formats:
+                font = self._derive(fmt=fmt)
+                release = fmt == formats[-1]
+                snapshots.append(font._buildvariableformat(ds, options, release))
+        return snapshots
 
-            otfds = compileFont(ds, **options)
+    @stage("format")
+    def _buildvariableformat(self, ds, options, release=False):
+
+        from fontTools.varLib import build as buildvf
+        from ufo2ft import (
+            compileInterpolatableOTFsFromDS,
+            compileInterpolatableTTFsFromDS,
+        )
+        from ufo2ft.outlineCompiler import OutlineOTFCompiler, OutlineTTFCompiler
+        from ufo2ft.preProcessor import (
+            OTFInterpolatablePreProcessor,
+            TTFInterpolatablePreProcessor,
+        )
+
+        if self.fmt == Format.TTF:
+            compileFont = compileInterpolatableTTFsFromDS
+            classes = (TTFInterpolatablePreProcessor, OutlineTTFCompiler)
+        else:
+            compileFont = compileInterpolatableOTFsFromDS
+            classes = (OTFInterpolatablePreProcessor, OutlineOTFCompiler)
+
+        # Resume from the built VF, or from the compiled masters.
+        checkpoint = self._checkpointkey("varlib")
+        restored = self._loadcheckpoint(checkpoint)
+        if restored is not None:
+            (vf,) = restored
+        else:
+            masters = self._checkpointkey("compile")
+            fonts = self._loadcheckpoint(masters)
+            if fonts is not None:
+                otfds = ds.deepcopyExceptFonts()
+            else:
+                with self._stage("compile"):
+                    glyphCache = self._glyphcache()
+                    if glyphCache is not None:
+                        otfds = compileFont(
+                            ds, **options, **glyphCache.compileroptions(*classes)
+                        )
+                        glyphCache.save()
+                    else:
+                        otfds = compileFont(ds, **options)
+                fonts = [source.font for source in otfds.sources]
+                fonts = self._savecheckpoint(masters, fonts)
+            for source, font in zip(otfds.sources, fonts):
+                source.font = font
+
+            # The masters are not compiled again, free their glyphs before the
+            # rest of the build.
+            if release:
+                for source in ds.sources:
+                    releaseGlyphs(source.font)
 
             if "source" in self.ttf:
                 from fontTools.ttLib import TTFont
@@ -911,85 +3066,164 @@ class Font:
                         self.name = Path(source.path).stem
                         source.font = self._copytables(source.font, otl)
 
-            vf, _, _ = buildvf(otfds)
+            with self._stage("varlib"):
+                vf, _, _ = buildvf(otfds)
+            (vf,) = self._savecheckpoint(checkpoint, [vf])
+
+        vf = self._setnames(vf)
+        vf = self._postprocess(vf)
+        self._setfeatureparams(vf)
+        return FontSnapshot(vf)
+
+    def _variabletasks(self, snapshot, scheduler):
+        """Add the tasks building the subsets, the instances and the VF itself
+        from the snapshot of the VF, and return them. Selecting instances
+        skips the rest."""
+        from functools import partial
+
+        vf = snapshot.open()
+        key = f"{self.filename}:{id(snapshot)}"
+        calls = []
+        if self.subsets and self.selectedinstances is None:
+            calls += self._subsetcalls(vf, key)
+        if self.instances is not None:
+            calls += self._instancecalls(vf, key)
+        if self.selectedinstances is None:
+            calls.append(partial(self._finishvariable, key))
+
+        shared = scheduler.share(snapshot)
+        memory = fontTaskMemory(snapshot)
+        return [
+            scheduler.add(
+                _snapshotcall, key, shared, call, memory=memory, group=self.fontname
+            )
+            for call in calls
+        ]
+
+    def _finishvariable(self, key):
+        vf = _snapshots[key].open()
+        self._addvfsuffix(vf)
+        vf = self._optimize(vf)
+        return [*self._buildwoff(vf), *self._saveselected(vf)]
 
-            vf = self._setnames(vf)
-            vf = self._postprocess(vf)
-            self._setfeatureparams(vf)
-            self._subset(vf)
-            self._instanciate(vf)
-            self._addvfsuffix(vf)
-            vf = self._optimize(vf)
-            self._buildwoff(vf)
-            self._save(vf)
+    def _buildstatic(self, formats):
+        """Compile the font in each format, and return their snapshots."""
+        ufo = self._openufo(self.source)
+        options = self._featureoptions([ufo])
+
+        # Both formats are compiled in the same task, as they share the loaded
+        # source and compiled features.
+        snapshots = []
+        with SaveState(self), self._stage("font"):
+            for fmt in formats:
+                font = self._derive(fmt=fmt)
+                release = fmt == formats[-1]
+                snapshots.append(font._buildstaticformat(ufo, options, release))
+        return snapshots
+
+    def _statictask(self, snapshot, scheduler):
+        """Add the task finishing the compiled font from its snapshot, and
+        return it."""
+        return scheduler.add(
+            self._finishstatic,
+            snapshot,
+            memory=fontTaskMemory(snapshot),
+            group=self.fontname,
+        )
 
-    def _buildstatic(self):
+    @stage("format")
+    def _buildstaticformat(self, ufo, options, release=False):
         from ufo2ft import compileOTF, compileTTF
+        from ufo2ft.outlineCompiler import OutlineOTFCompiler, OutlineTTFCompiler
+        from ufo2ft.preProcessor import OTFPreProcessor, TTFPreProcessor
 
-        ufo = self._openufo(self.source)
+        options = dict(options)
+        if self.fmt == Format.TTF:
+            compileFont = compileTTF
+            classes = (TTFPreProcessor, OutlineTTFCompiler)
+        else:
+            compileFont = compileOTF
+            classes = (OTFPreProcessor, OutlineOTFCompiler)
+            options["optimizeCFF"] = False
 
-        for fmt in (Format.TTF, Format.OTF):
-            self.fmt = fmt
-            options = {}
-            if fmt == Format.TTF:
-                compileFont = compileTTF
-            elif fmt == Format.OTF:
-                compileFont = compileOTF
-                options["optimizeCFF"] = False
-            else:
-                continue
+        options["removeOverlaps"] = True
+        options["overlapsBackend"] = "pathops"
+        if {"GDEF", "GSUB", "GPOS"}.issubset(self.ttf.get("tables", {})):
+            options["featureWriters"] = []
 
-            options["removeOverlaps"] = True
-            options["overlapsBackend"] = "pathops"
-            if {"GDEF", "GSUB", "GPOS"}.issubset(self.ttf.get("tables", {})):
-                options["featureWriters"] = []
+        glyphCache = self._glyphcache()
+        if glyphCache is not None:
+            options.update(glyphCache.compileroptions(*classes))
 
-            otf = compileFont(
-                ufo,
-                **options,
-            )
+        checkpoint = self._checkpointkey("compile")
+        restored = self._loadcheckpoint(checkpoint)
+        if restored is not None:
+            (otf,) = restored
+        else:
+            with self._stage("compile"):
+                otf = compileFont(
+                    ufo,
+                    **options,
+                )
+
+                if glyphCache is not None:
+                    glyphCache.save()
 
             if (
-                fmt == Format.TTF
+                self.fmt == Format.TTF
                 and "decompose" in self.components
                 and self.components["decompose"] == "overlapping"
             ):
-                from fontTools.ttLib.removeOverlaps import removeTTGlyphOverlaps
-
                 # Decompose composite glyphs with overlapping components, and
                 # remove overelap. We already decomposed simple glyphs while
-                # building the font, so we process only composite glyphs below.
-                # The removeTTGlyphOverlaps function only decomposes composites
-                # with overlapping components, so we don’t check for the
-                # overlap ourselves.
+                # building the font, so we process only composite glyphs below,
+                # and only those whose component boxes intersect (see
+                # overlappingComposites()).
                 logger.info(f"Decomposing {self.name} overlapping components")
-                glyf = otf["glyf"]
-                hmtx = otf["hmtx"]
-                glyphSet = otf.getGlyphSet()
-                glyphOrder = otf.getGlyphOrder()
-                for name in glyphOrder:
-                    glyph = glyf[name]
-                    if glyph.isComposite():
-                        removeTTGlyphOverlaps(name, glyphSet, glyf, hmtx, False)
+                with self._stage("decompose"):
+                    self._decomposeoverlapping(otf)
 
-            if "source" in self.ttf:
-                from fontTools.ttLib import TTFont
+            (otf,) = self._savecheckpoint(checkpoint, [otf])
 
-                otl = TTFont(self.ttf["source"])
-                otf = self._copytables(otf, otl)
+        if release:
+            releaseGlyphs(ufo)
 
-            otf = self._setnames(otf)
-            otf = self._postprocess(otf)
-            otf = self._autohint(otf)
-            self._setfeatureparams(otf)
-            self._subset(otf)
-            otf = self._optimize(otf)
-            self._buildwoff(otf)
-            self._save(otf)
+        if "source" in self.ttf:
+            from fontTools.ttLib import TTFont
+
+            otl = TTFont(self.ttf["source"])
+            otf = self._copytables(otf, otl)
+
+        otf = self._setnames(otf)
+        otf = self._postprocess(otf)
+
+        return FontSnapshot(otf)
+
+    def _finishstatic(self, snapshot):
+        otf = snapshot.open()
+        otf = self._autohint(otf)
+        self._setfeatureparams(otf)
+        saved = []
+        if self.selectedinstances is None:
+            saved += self._subset(otf)
+        otf = self._optimize(otf)
+        saved += self._buildwoff(otf)
+        saved += self._saveselected(otf)
+
+        return saved
 
 
 class Builder:
-    def __init__(self, path):
+    def __init__(
+        self,
+        path,
+        jobs=1,
+        cache=None,
+        compression=None,
+        subroutinization=None,
+        resume=False,
+        resident=False,
+    ):
         with open(path) as f:
             project = yaml.safe_load(f)
             project["path"] = path
@@ -999,14 +3233,235 @@ class Builder:
 
         self.fonts = []
         for name, conf in project.get("fonts", {}).items():
+            if compression is not None:
+                conf = {**conf, "compression": compression}
+            if subroutinization is not None:
+                conf = {**conf, "subroutinization": subroutinization}
             self.fonts.append(Font(name, conf, project))
 
         if not self.fonts:
             raise RuntimeError("There are no fonts in the project.")
 
-    def build(self):
+        self.jobs = jobs
+        self.cache = cache
+        # Resident sources stay loaded in this process, so its fonts are all
+        # compiled here, one at a time.
+        self.resident = resident
+        for font in self.fonts:
+            font.cache = cache
+            font.resume = resume
+            font.resident = resident
+
+    def select(self, fonts=None, formats=None, instances=None):
+        """Build only the given fonts, formats and instances, see Font.select().
+        Static fonts are instances of themselves.
+
+        Return the unknown font and instance names, as an error message, or
+        None."""
+        if fonts:
+            names = {font.name for font in self.fonts}
+            unknown = [name for name in fonts if name not in names]
+            if unknown:
+                return "unknown font: " + ", ".join(f"“{n}”" for n in unknown)
+            self.fonts = [font for font in self.fonts if font.name in fonts]
+        if instances:
+            unknown = [
+                name
+                for name in instances
+                if not any(font.hasinstance(name) for font in self.fonts)
+            ]
+            if unknown:
+                return "unknown instance: " + ", ".join(f"“{n}”" for n in unknown)
+            self.fonts = [
+                font
+                for font in self.fonts
+                if any(font.hasinstance(name) for name in instances)
+            ]
         for font in self.fonts:
-            font.build()
+            font.select(formats, instances)
+        return None
+
+    def build(self, fonts=None):
+        """Build the given fonts of the project, or all of them."""
+        if fonts is None:
+            fonts = self.fonts
+        try:
+            with profile("build"):
+                self._build(fonts)
+        finally:
+            if self.cache is not None:
+                self.cache.evict()
+
+    def _build(self, fonts):
+        # The tasks of all the fonts share one scheduler, so that its workers
+        # and memory budget bound the whole build.
+        scheduler = Scheduler(self.jobs, tag=self.jobs > 1 and len(fonts) > 1)
+        for font in fonts:
+            scheduler.add(font.build, scheduler, local=True, group=font.fontname)
+        scheduler.run()
+
+        if scheduler.failed:
+            raise RuntimeError(f"Failed to build: {', '.join(scheduler.failed)}")
+
+
+# Seconds between checks of the sources for changes.
+WATCH_INTERVAL = 0.2
+
+
+class Watcher:
+    """Builds the fonts of a project whenever their sources change, keeping
+    the sources loaded in memory between builds.
+
+    `makebuilder` returns a new Builder of the project, the fonts to build are
+    taken from it."""
+
+    def __init__(self, project, makebuilder, interval=WATCH_INTERVAL):
+        self.project = Path(project)
+        self.makebuilder = makebuilder
+        self.interval = interval
+        self.builder = None
+        self.projectstamps = None
+        self.stamps = {}
+        self.listings = {}
+
+    def changed(self):
+        """Return the fonts whose sources changed since they were last built."""
+        stamps = fileStamps([self.project], self.listings)
+        if stamps != self.projectstamps:
+            # Set up again, or wait for the next change if that fails.
+            self.projectstamps = stamps
+            self.builder = None
+            self.stamps = {}
+            _residentufos.clear()
+            self.builder = self.makebuilder()
+        if self.builder is None:
+            return []
+
+        fonts = []
+        for font in self.builder.fonts:
+            stamps = fileStamps(font._sources(), self.listings)
+            if stamps != self.stamps.get(font.name):
+                self.stamps[font.name] = stamps
+                fonts.append(font)
+        return fonts
+
+    def build(self, changed=True):
+        """Build the fonts whose sources changed, or all of them, and return
+        whether the build succeeded."""
+        import time
+
+        try:
+            names = {font.name for font in self.changed()}
+            if self.builder is not None and (names or not changed):
+                # The fonts are set up again, as building modifies them.
+                builder = self.makebuilder()
+                fonts = [f for f in builder.fonts if not changed or f.name in names]
+                start = time.perf_counter()
+                builder.build(fonts)
+                built = ", ".join(font.name for font in fonts)
+                logger.info(f"Built {built} in {time.perf_counter() - start:.1f}s")
+        except Exception as error:
+            logger.error("Build failed", exc_info=error)
+            return False
+        return True
+
+    def run(self, listener=None):
+        """Build on changes until interrupted, and whenever a client connects
+        to listener (see requestBuild())."""
+        import queue
+        import threading
+
+        requests = queue.Queue()
+        if listener is not None:
+
+            def accept():
+                while True:
+                    try:
+                        requests.put(listener.accept())
+                    except OSError:
+                        return
+
+            threading.Thread(target=accept, daemon=True).start()
+
+        self.build()
+        logger.info(f"Watching {self.project.name} sources for changes")
+        while True:
+            try:
+                connection = requests.get(timeout=self.interval)
+            except queue.Empty:
+                self.build()
+            else:
+                self._serve(connection)
+
+    def _serve(self, connection):
+        handler = ConnectionLogHandler(connection)
+        handler.setFormatter(ColorLogFormatter())
+        root = logging.getLogger()
+        root.addHandler(handler)
+        try:
+            connection.recv()
+            connection.send(("done", self.build(changed=False)))
+        except (OSError, EOFError):
+            # The client went away.
+            pass
+        finally:
+            root.removeHandler(handler)
+            connection.close()
+
+
+class ConnectionLogHandler(logging.Handler):
+    """Sends the log messages of this process to a daemon client."""
+
+    def __init__(self, connection):
+        import os
+
+        super().__init__()
+        self.connection = connection
+        self.pid = os.getpid()
+
+    def emit(self, record):
+        import os
+
+        # Worker processes inherit the handler, but must not write to the
+        # connection.
+        if os.getpid() != self.pid:
+            return
+        try:
+            self.connection.send(("log", self.format(record)))
+        except Exception:
+            self.handleError(record)
+
+
+def listen(address):
+    """Return a listener for the clients of a daemon at address, a Unix
+    socket path."""
+    import os
+    from multiprocessing.connection import Client, Listener
+
+    if os.path.exists(address):
+        try:
+            Client(str(address), family="AF_UNIX").close()
+        except ConnectionRefusedError:
+            # Left behind by a daemon that did not exit cleanly.
+            os.unlink(address)
+        else:
+            raise RuntimeError(f"A daemon is already listening at {address}")
+    return Listener(str(address), family="AF_UNIX")
+
+
+def requestBuild(address):
+    """Ask the daemon listening at address to build its project, print its log
+    messages, and return whether the build succeeded."""
+    import sys
+    from multiprocessing.connection import Client
+
+    with Client(str(address), family="AF_UNIX") as connection:
+        connection.send(("build",))
+        while True:
+            kind, value = connection.recv()
+            if kind == "done":
+                return value
+            print(value, file=sys.stderr)
 
 
 class ColorLogFormatter(logging.Formatter):
@@ -1026,24 +3481,225 @@ class ColorLogFormatter(logging.Formatter):
         return logging.Formatter(fmt).format(record)
 
 
+class FontLogFilter(logging.Filter):
+    def __init__(self, font):
+        super().__init__()
+        self.font = font
+
+    def filter(self, record):
+        record.name = f"{record.name}:{self.font}"
+        return True
+
+
+def setuplogging(level):
+    ch = logging.StreamHandler()
+    ch.setLevel(logging.DEBUG)
+    ch.setFormatter(ColorLogFormatter())
+    logging.basicConfig(level=level, handlers=[ch])
+
+
 def main(args=None):
     from argparse import ArgumentParser
 
     parser = ArgumentParser(description="Build Tiro fonts.")
     parser.add_argument("project", metavar="PROJECT", help="Project file.", type=Path)
     parser.add_argument("-q", "--quite", action="store_true", help="Be quite")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        metavar="N",
+        type=int,
+        default=1,
+        help="Number of worker processes shared by all the fonts, running the "
+        "build tasks in parallel (0 for number of CPUs).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        type=Path,
+        help="Build cache directory (default: .tirobuild-cache next to PROJECT).",
+    )
+    parser.add_argument(
+        "--cache-size",
+        metavar="MB",
+        type=int,
+        default=1024,
+        help="Maximum size of the build cache in megabytes (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Don’t use the build cache."
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Save checkpoints of the expensive stages in the build cache, and "
+        "resume from them if a previous build with this option failed.",
+    )
+    parser.add_argument(
+        "--font",
+        metavar="NAME",
+        action="append",
+        help="Only build this font of the project (can be repeated).",
+    )
+    parser.add_argument(
+        "--instance",
+        metavar="NAME",
+        action="append",
+        help="Only build this static instance, matched as the “instances” keys "
+        "(can be repeated). Variable fonts and subsets are not built.",
+    )
+    parser.add_argument(
+        "--format",
+        metavar="FORMAT",
+        action="append",
+        choices=[f.value for f in Format],
+        help="Only build this format (can be repeated).",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep the sources loaded, and build the fonts whose sources change "
+        "until interrupted.",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Like --watch, and also build the project when asked by --connect.",
+    )
+    parser.add_argument(
+        "--connect",
+        action="store_true",
+        help="Ask the daemon of PROJECT to build it, instead of building here.",
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        type=Path,
+        help="Unix socket of the daemon (default: .tirobuild-daemon next to "
+        "PROJECT).",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="REPORT",
+        type=Path,
+        help="Profile the build stages and write a JSON report to REPORT.",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="TRACE",
+        type=Path,
+        help="Write a Chrome Trace Event Format timeline of the build to TRACE.",
+    )
+    parser.add_argument(
+        "--profile-allocations",
+        metavar="N",
+        type=int,
+        default=0,
+        help="Record the top N Python memory allocators of each profiled stage.",
+    )
+    parser.add_argument(
+        "--compression",
+        metavar="PROFILE",
+        choices=list(COMPRESSION_PROFILES),
+        help="Web fonts compression profile, overriding the project one.",
+    )
+    parser.add_argument(
+        "--subroutinization",
+        metavar="MODE",
+        choices=SUBROUTINIZATION_MODES,
+        help="CFF subroutinization mode, overriding the project one.",
+    )
     options = parser.parse_args(args)
 
-    ch = logging.StreamHandler()
-    ch.setLevel(logging.DEBUG)
-    ch.setFormatter(ColorLogFormatter())
     if options.quite:
-        logging.basicConfig(level=logging.WARNING, handlers=[ch])
+        setuplogging(logging.WARNING)
     else:
-        logging.basicConfig(level=logging.INFO, handlers=[ch])
+        setuplogging(logging.INFO)
 
-    builder = Builder(options.project)
-    builder.build()
+    if options.resume and options.no_cache:
+        parser.error("--resume requires the build cache")
+
+    watch = options.watch or options.daemon
+    if watch and (options.profile is not None or options.trace is not None):
+        parser.error("--profile and --trace can not be used with --watch or --daemon")
+
+    address = options.socket
+    if address is None:
+        address = options.project.parent / ".tirobuild-daemon"
+    if options.connect:
+        try:
+            return 0 if requestBuild(address) else 1
+        except (FileNotFoundError, ConnectionRefusedError):
+            parser.error(f"no daemon is listening at {address}")
+
+    jobs = options.jobs
+    if jobs < 1:
+        import os
+
+        jobs = os.cpu_count() or 1
+
+    cache = None
+    if not options.no_cache:
+        path = options.cache_dir
+        if path is None:
+            path = options.project.parent / ".tirobuild-cache"
+        cache = Cache(path, options.cache_size * 1024 * 1024)
+
+    def selectedbuilder():
+        builder = Builder(
+            options.project,
+            jobs,
+            cache,
+            options.compression,
+            options.subroutinization,
+            options.resume,
+            watch,
+        )
+        formats = [Format(f) for f in options.format or []]
+        return builder, builder.select(options.font, formats, options.instance)
+
+    def makebuilder():
+        # In watch mode, a project change making the selection invalid fails
+        # the build instead of stopping the watcher.
+        builder, error = selectedbuilder()
+        if error is not None:
+            raise RuntimeError(error)
+        return builder
+
+    builder, error = selectedbuilder()
+    if error is not None:
+        parser.error(error)
+
+    if watch:
+        listener = listen(address) if options.daemon else None
+        try:
+            Watcher(options.project, makebuilder).run(listener)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if listener is not None:
+                listener.close()
+        return
+
+    if options.profile is None and options.trace is None:
+        builder.build()
+        return
+
+    import tempfile
+
+    global _profiler
+
+    with tempfile.TemporaryDirectory() as d:
+        _profiler = Profiler(d, options.profile_allocations)
+        _profiler.start()
+        try:
+            builder.build()
+        finally:
+            if options.profile is not None:
+                _profiler.report(options.profile)
+            if options.trace is not None:
+                _profiler.trace(options.trace)
+            _profiler = None
 
 
 if __name__ == "__main__":